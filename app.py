@@ -2,15 +2,23 @@
 Smart Job Market Analyzer - Streamlit Web Application
 A beautiful interface for AI-powered career insights!
 """
+import asyncio
+import gc
+import threading
+from collections import deque
+from itertools import islice
+
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
+import orjson
 from dotenv import load_dotenv
 
-from src.agents.career_agent import CareerAgent
+from src.agents.career_agent import CareerAgent, run_async
 from src.analytics.analyzer import JobAnalyzer
-from src.rag.vector_store import JobVectorStore
+from src.rag.vector_store import get_vector_store
 from src.etl.database import JobDatabase
 
 # Load environment
@@ -24,47 +32,59 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        padding: 1rem 0;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        color: white;
-    }
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 24px;
-    }
-    .stTabs [data-baseweb="tab"] {
-        height: 50px;
-        padding: 10px 20px;
-        background-color: #f0f2f6;
-        border-radius: 5px;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS - served from static/custom.css (see .streamlit/config.toml) so the
+# browser caches it; only this short tag is re-sent on each rerun
+st.markdown('<link rel="stylesheet" href="app/static/custom.css">', unsafe_allow_html=True)
+
+
+# Quick action buttons: (label, key, help text, question template)
+QUICK_ACTIONS = [
+    ("💡 Skills", "btn_skills", "Get skill recommendations",
+     "What skills should I learn to become a {role}? What are the most important technical and soft skills needed?"),
+    ("💰 Salary", "btn_salary", "Get salary information",
+     "What is the salary range for {role}? Break it down by experience level (entry, mid, senior)."),
+    ("🏢 Companies", "btn_companies", "See hiring companies",
+     "Which companies are hiring {role}s? What are the top employers and what do they look for?"),
+    ("📈 Trends", "btn_trends", "Get market trends",
+     "What are the current job market trends for {role}? Is demand growing? What's the future outlook?"),
+]
+
+# Chat history limits: kept in session, drawn on screen, sent to the LLM
+MAX_MESSAGES = 20
+SHOWN_MESSAGES = 10
+CONTEXT_MESSAGES = 6
+
+# Force a garbage collection every N analytics renders
+GC_EVERY_RENDERS = 10
 
 
 @st.cache_resource
 def load_components():
     """Load and cache expensive components."""
     db = JobDatabase()
-    vs = JobVectorStore()
+    vs = get_vector_store()
+    # Load the embedding model and open the LLM connection in the background
+    threading.Thread(target=vs.warmup, daemon=True).start()
     analyzer = JobAnalyzer(db)
-    agent = CareerAgent(vs, db)
+    agent = CareerAgent(vs, db, warmup=True)
     return db, vs, analyzer, agent
 
 
+@st.cache_data(ttl=3600)
+def _cached_report(_analyzer, data_version: tuple) -> dict:
+    """Cache the market report until the data changes (or the TTL expires)."""
+    return _analyzer.generate_market_report()
+
+
+@st.cache_data(ttl=3600)
+def _report_json(_analyzer, data_version: tuple) -> bytes:
+    """Serialize the cached market report as real JSON (not a Python repr)."""
+    return orjson.dumps(
+        _cached_report(_analyzer, data_version),
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    )
+
+
 def main():
     # Header
     st.markdown('<h1 class="main-header">📊 Smart Job Market Analyzer</h1>', unsafe_allow_html=True)
@@ -114,89 +134,75 @@ def render_advisor_page(agent, analyzer):
     
     # Initialize session state
     if "messages" not in st.session_state:
-        st.session_state.messages = []
-    if "user_input" not in st.session_state:
-        st.session_state.user_input = ""
+        st.session_state.messages = deque(maxlen=MAX_MESSAGES)
     
     # Instructions
-    st.info("💡 **How to use:** Enter a job role (e.g., 'ML Engineer') and click a Quick Action, OR type a full question and press Enter.")
+    st.info("💡 **How to use:** Enter a job role (e.g., 'ML Engineer') and click a Quick Action, OR type a full question in the chat box below.")
     
-    # Text input for role or full question
-    user_input = st.text_input(
-        "Enter a job role OR type your full question:",
-        placeholder="e.g., 'ML Engineer' or 'Should I learn RAG systems for AI jobs?'",
+    # Text input for the role used by the quick actions
+    role = st.text_input(
+        "Enter a job role for the Quick Actions:",
+        placeholder="e.g., 'ML Engineer' or 'Data Scientist'",
         key="main_input"
     )
     
     # Quick action buttons
-    st.markdown("**Quick Actions** (uses your input above):")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    question_to_ask = None
-    
-    with col1:
-        if st.button("💡 Skills", key="btn_skills", help="Get skill recommendations"):
-            if user_input.strip():
-                question_to_ask = f"What skills should I learn to become a {user_input}? What are the most important technical and soft skills needed?"
-            else:
-                st.warning("⚠️ Please enter a job role first!")
-    
-    with col2:
-        if st.button("💰 Salary", key="btn_salary", help="Get salary information"):
-            if user_input.strip():
-                question_to_ask = f"What is the salary range for {user_input}? Break it down by experience level (entry, mid, senior)."
-            else:
-                st.warning("⚠️ Please enter a job role first!")
-    
-    with col3:
-        if st.button("🏢 Companies", key="btn_companies", help="See hiring companies"):
-            if user_input.strip():
-                question_to_ask = f"Which companies are hiring {user_input}s? What are the top employers and what do they look for?"
-            else:
-                st.warning("⚠️ Please enter a job role first!")
-    
-    with col4:
-        if st.button("📈 Trends", key="btn_trends", help="Get market trends"):
-            if user_input.strip():
-                question_to_ask = f"What are the current job market trends for {user_input}? Is demand growing? What's the future outlook?"
-            else:
-                st.warning("⚠️ Please enter a job role first!")
-    
-    # Submit full question button
+    st.markdown("**Quick Actions** (uses your role above):")
+    
+    for col, (label, key, help_text, template) in zip(st.columns(4), QUICK_ACTIONS):
+        with col:
+            if st.button(label, key=key, help=help_text):
+                if role.strip():
+                    # Quick actions use the fast model
+                    st.session_state.pending_prompt = (template.format(role=role), "instant")
+                else:
+                    st.warning("⚠️ Please enter a job role first!")
+    
+    # Full brief / clear buttons
     col1, col2 = st.columns([1, 4])
     with col1:
-        if st.button("🚀 Ask Full Question", type="primary", key="btn_ask"):
-            if user_input.strip():
-                question_to_ask = user_input
+        if st.button("🎯 Full Brief", key="btn_brief", help="Run all four Quick Actions at once"):
+            if role.strip():
+                prompts = [template.format(role=role) for *_, template in QUICK_ACTIONS]
+                with st.spinner("🎯 Building your full brief..."):
+                    answers = run_async(_ask_all(agent, prompts))
+                st.session_state.brief = (role, answers)
             else:
-                st.warning("⚠️ Please enter a question first!")
+                st.warning("⚠️ Please enter a job role first!")
     with col2:
-        if st.session_state.messages:
+        if st.session_state.messages or st.session_state.get("brief"):
             if st.button("🗑️ Clear Chat", key="btn_clear"):
-                st.session_state.messages = []
+                st.session_state.messages.clear()
+                st.session_state.brief = None
                 st.rerun()
     
     st.divider()
     
-    # Process the question if one was set
-    if question_to_ask:
-        # Add user message to history
-        st.session_state.messages.append({"role": "user", "content": question_to_ask})
-        
-        # Generate response
-        with st.spinner("🔍 Analyzing job market data..."):
-            response = agent.ask(question_to_ask)
-        
-        # Add assistant response to history
-        st.session_state.messages.append({"role": "assistant", "content": response})
-        
-        # Rerun to show updated chat
-        st.rerun()
+    # Full brief: the four quick actions in a 2x2 grid
+    if st.session_state.get("brief"):
+        role, answers = st.session_state.brief
+        st.markdown(f"### 🎯 Full Brief: {role}")
+        cells = st.columns(2) + st.columns(2)
+        for cell, (label, *_), answer in zip(cells, QUICK_ACTIONS, answers):
+            with cell:
+                st.markdown(f"#### {label}")
+                st.markdown(answer)
+        st.divider()
+    
+    # A quick action wins over the chat box; full questions use the balanced model
+    pending = st.session_state.pop("pending_prompt", None)
+    prompt = st.chat_input("Ask about the job market...")
+    if pending:
+        question, tier = pending
+    elif prompt:
+        question, tier = prompt, "balanced"
+    else:
+        question = None
     
     # Display chat history
-    if st.session_state.messages:
+    if st.session_state.messages or question:
         st.markdown("### 💬 Conversation")
-        for message in st.session_state.messages:
+        for message in list(st.session_state.messages)[-SHOWN_MESSAGES:]:
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
     else:
@@ -207,18 +213,38 @@ def render_advisor_page(agent, analyzer):
         - Type `ML Engineer` → Click `💡 Skills` → Get skills for ML Engineers
         - Type `Data Scientist` → Click `💰 Salary` → Get salary info for Data Scientists
         
-        **Option 2: Full Question**
-        - Type `Should I learn RAG systems to become an AI Engineer?` → Click `🚀 Ask Full Question`
-        - Type `Compare Data Engineer vs ML Engineer careers` → Click `🚀 Ask Full Question`
-        - Type `I know Python and SQL, what should I learn next?` → Click `🚀 Ask Full Question`
+        **Option 2: Full Question** (in the chat box at the bottom)
+        - `Should I learn RAG systems to become an AI Engineer?`
+        - `Compare Data Engineer vs ML Engineer careers`
+        - `I know Python and SQL, what should I learn next?`
         """)
+    
+    # Answer the new question in place - no rerun needed
+    if question:
+        # Only typed follow-ups get the recent conversation as context
+        history = list(st.session_state.messages)[-CONTEXT_MESSAGES:] if not pending else None
+        
+        st.session_state.messages.append({"role": "user", "content": question})
+        with st.chat_message("user"):
+            st.markdown(question)
+        
+        # Stream the response straight into the chat message
+        with st.chat_message("assistant"):
+            response = st.write_stream(agent.ask_stream(question, tier=tier, history=history))
+        
+        st.session_state.messages.append({"role": "assistant", "content": response})
+
+
+async def _ask_all(agent, prompts: list[str]) -> list[str]:
+    """Ask several quick-action questions concurrently."""
+    return await asyncio.gather(*(agent.ask_async(prompt, tier="instant") for prompt in prompts))
 
 
 def render_analytics_page(analyzer):
     """Market analytics with charts."""
     st.header("📈 Market Analytics")
     
-    report = analyzer.generate_market_report()
+    report = _cached_report(analyzer, analyzer.db.data_version())
     
     # Top metrics row
     col1, col2, col3, col4 = st.columns(4)
@@ -228,10 +254,10 @@ def render_analytics_page(analyzer):
         remote_pct = report['remote_stats']['remote_percentage']
         st.metric("🏠 Remote Jobs", f"{remote_pct}%")
     with col3:
-        top_skill = list(report['top_skills'].keys())[0] if report['top_skills'] else "N/A"
+        top_skill = next(iter(report['top_skills']), "N/A")
         st.metric("🔥 Top Skill", top_skill)
     with col4:
-        top_company = list(report['top_companies'].keys())[0] if report['top_companies'] else "N/A"
+        top_company = next(iter(report['top_companies']), "N/A")
         st.metric("🏢 Top Employer", top_company)
     
     st.divider()
@@ -241,69 +267,105 @@ def render_analytics_page(analyzer):
     
     with col1:
         st.subheader("🔧 Most In-Demand Skills")
-        skills_df = pd.DataFrame(
-            list(report['top_skills'].items()),
-            columns=['Skill', 'Count']
-        )
-        fig = px.bar(
-            skills_df, x='Count', y='Skill',
-            orientation='h',
-            color='Count',
-            color_continuous_scale='Viridis'
-        )
-        fig.update_layout(height=400, showlegend=False, yaxis={'categoryorder': 'total ascending'})
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_skills_chart(report['top_skills']), use_container_width=True)
     
     with col2:
         st.subheader("💰 Highest Paying Skills")
-        paying_skills = report['highest_paying_skills']
-        if paying_skills:
-            skills_salary_df = pd.DataFrame(
-                list(paying_skills.items()),
-                columns=['Skill', 'Avg Salary']
-            )
-            fig = px.bar(
-                skills_salary_df, x='Avg Salary', y='Skill',
-                orientation='h',
-                color='Avg Salary',
-                color_continuous_scale='Greens'
-            )
-            fig.update_layout(height=400, showlegend=False, yaxis={'categoryorder': 'total ascending'})
-            st.plotly_chart(fig, use_container_width=True)
+        if report['highest_paying_skills']:
+            st.plotly_chart(_paying_skills_chart(report['highest_paying_skills']), use_container_width=True)
     
     # Charts row 2
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("💼 Salary by Experience")
-        salary_data = report['salary_by_experience']
-        if salary_data:
-            levels = list(salary_data.keys())
-            mins = [salary_data[l]['min'] for l in levels]
-            maxs = [salary_data[l]['max'] for l in levels]
-            
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='Min Salary', x=levels, y=mins, marker_color='#667eea'))
-            fig.add_trace(go.Bar(name='Max Salary', x=levels, y=maxs, marker_color='#764ba2'))
-            fig.update_layout(barmode='group', height=400)
-            st.plotly_chart(fig, use_container_width=True)
+        if report['salary_by_experience']:
+            st.plotly_chart(_salary_chart(report['salary_by_experience']), use_container_width=True)
     
     with col2:
         st.subheader("🏠 Remote vs On-Site")
         remote_stats = report['remote_stats']
-        fig = px.pie(
-            values=[remote_stats['remote_count'], remote_stats['onsite_count']],
-            names=['Remote', 'On-Site'],
-            color_discrete_sequence=['#667eea', '#764ba2']
+        st.plotly_chart(
+            _remote_chart(remote_stats['remote_count'], remote_stats['onsite_count']),
+            use_container_width=True
         )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
     
     # Location chart
     st.subheader("📍 Jobs by Location")
-    location_df = pd.DataFrame(
-        list(report['location_distribution'].items()),
-        columns=['Location', 'Count']
+    st.plotly_chart(_location_chart(report['location_distribution']), use_container_width=True)
+    
+    # The cached figures come back as fresh copies each run - collect the
+    # old ones every few renders instead of waiting for the GC to get to them
+    st.session_state.render_count = st.session_state.get('render_count', 0) + 1
+    if st.session_state.render_count % GC_EVERY_RENDERS == 0:
+        gc.collect()
+
+
+# Chart builders - each figure is a pure function of a small slice of the
+# report, so Streamlit caches it and tab switches skip the Plotly work.
+
+@st.cache_data
+def _skills_chart(top_skills: dict) -> go.Figure:
+    skills_df = (
+        pd.DataFrame.from_dict(top_skills, orient='index', columns=['Count'])
+        .rename_axis('Skill').reset_index()
+    )
+    fig = px.bar(
+        skills_df, x='Count', y='Skill',
+        orientation='h',
+        color='Count',
+        color_continuous_scale='Viridis'
+    )
+    fig.update_layout(height=400, showlegend=False, yaxis={'categoryorder': 'total ascending'})
+    return fig
+
+
+@st.cache_data
+def _paying_skills_chart(paying_skills: dict) -> go.Figure:
+    skills_salary_df = (
+        pd.DataFrame.from_dict(paying_skills, orient='index', columns=['Avg Salary'])
+        .rename_axis('Skill').reset_index()
+    )
+    fig = px.bar(
+        skills_salary_df, x='Avg Salary', y='Skill',
+        orientation='h',
+        color='Avg Salary',
+        color_continuous_scale='Greens'
+    )
+    fig.update_layout(height=400, showlegend=False, yaxis={'categoryorder': 'total ascending'})
+    return fig
+
+
+@st.cache_data
+def _salary_chart(salary_data: dict) -> go.Figure:
+    salary_df = pd.DataFrame.from_dict(salary_data, orient='index')
+    levels = salary_df.index
+    mins = salary_df['min'].to_numpy()
+    maxs = salary_df['max'].to_numpy()
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(name='Min Salary', x=levels, y=mins, marker_color='#667eea'))
+    fig.add_trace(go.Bar(name='Max Salary', x=levels, y=maxs, marker_color='#764ba2'))
+    fig.update_layout(barmode='group', height=400)
+    return fig
+
+
+@st.cache_data
+def _remote_chart(remote_count: int, onsite_count: int) -> go.Figure:
+    fig = px.pie(
+        values=[remote_count, onsite_count],
+        names=['Remote', 'On-Site'],
+        color_discrete_sequence=['#667eea', '#764ba2']
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+@st.cache_data
+def _location_chart(location_distribution: dict) -> go.Figure:
+    location_df = (
+        pd.DataFrame.from_dict(location_distribution, orient='index', columns=['Count'])
+        .rename_axis('Location').reset_index()
     )
     fig = px.bar(
         location_df, x='Location', y='Count',
@@ -311,7 +373,7 @@ def render_analytics_page(analyzer):
         color_continuous_scale='Blues'
     )
     fig.update_layout(height=350)
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
 def render_search_page(vs, db):
@@ -348,12 +410,9 @@ def render_search_page(vs, db):
                     query,
                     n_results=num_results,
                     experience_level=exp_level if exp_level != "All" else None,
-                    remote_only=remote_only
+                    remote_only=remote_only,
+                    min_salary=min_salary or None
                 )
-                
-                # Filter by salary if specified
-                if min_salary > 0:
-                    results = [r for r in results if r['metadata'].get('salary_min', 0) >= min_salary]
             
             st.success(f"Found {len(results)} matching jobs!")
             
@@ -388,7 +447,8 @@ def render_report_page(analyzer):
     """Full market report page."""
     st.header("📋 Complete Market Report")
     
-    report = analyzer.generate_market_report()
+    data_version = analyzer.db.data_version()
+    report = _cached_report(analyzer, data_version)
     
     # Summary
     st.subheader("📊 Executive Summary")
@@ -396,10 +456,10 @@ def render_report_page(analyzer):
     summary_text = f"""
     Based on analysis of **{report['total_jobs']:,} job postings**, here are the key insights:
     
-    - **Top Skills in Demand:** {', '.join(list(report['top_skills'].keys())[:5])}
+    - **Top Skills in Demand:** {', '.join(islice(report['top_skills'], 5))}
     - **Remote Work:** {report['remote_stats']['remote_percentage']}% of jobs offer remote options
-    - **Top Hiring Companies:** {', '.join(list(report['top_companies'].keys())[:3])}
-    - **Highest Paying Skill:** {list(report['highest_paying_skills'].keys())[0] if report['highest_paying_skills'] else 'N/A'}
+    - **Top Hiring Companies:** {', '.join(islice(report['top_companies'], 3))}
+    - **Highest Paying Skill:** {next(iter(report['highest_paying_skills']), 'N/A')}
     """
     st.markdown(summary_text)
     
@@ -411,23 +471,17 @@ def render_report_page(analyzer):
         
         # By experience
         st.markdown("**By Experience Level:**")
-        for level, salary in report['salary_by_experience'].items():
-            col1, col2, col3 = st.columns([2, 1, 1])
-            with col1:
-                st.markdown(f"**{level}**")
-            with col2:
-                st.markdown(f"${salary['min']:,.0f}")
-            with col3:
-                st.markdown(f"${salary['max']:,.0f}")
+        if report['salary_by_experience']:
+            experience_df = pd.DataFrame.from_dict(report['salary_by_experience'], orient='index')[['min', 'max']]
+            st.dataframe(experience_df.style.format('${:,.0f}'), use_container_width=True)
         
         st.divider()
         
         # By role
         st.markdown("**By Role:**")
-        role_data = report['salary_by_role']
-        for role, salary in role_data.items():
-            if role != 'Other':
-                st.markdown(f"- **{role}:** ${salary['salary_min']:,.0f} - ${salary['salary_max']:,.0f}")
+        role_df = pd.DataFrame.from_dict(report['salary_by_role'], orient='index').drop(index='Other', errors='ignore')
+        if not role_df.empty:
+            st.dataframe(role_df.style.format('${:,.0f}', na_rep='-'), use_container_width=True)
     
     with tab2:
         st.subheader("Skills Analysis")
@@ -435,31 +489,37 @@ def render_report_page(analyzer):
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("**Most In-Demand:**")
-            for skill, count in list(report['top_skills'].items())[:10]:
-                st.markdown(f"- {skill}: {count} jobs")
+            st.dataframe(
+                pd.Series(dict(islice(report['top_skills'].items(), 10)), name='Jobs', dtype='int64'),
+                use_container_width=True
+            )
         
         with col2:
             st.markdown("**Highest Paying:**")
-            for skill, salary in list(report['highest_paying_skills'].items())[:10]:
-                st.markdown(f"- {skill}: ${salary:,.0f}")
+            paying = pd.Series(dict(islice(report['highest_paying_skills'].items(), 10)), name='Avg Salary', dtype='float64')
+            st.dataframe(paying.to_frame().style.format('${:,.0f}'), use_container_width=True)
     
     with tab3:
         st.subheader("Company Analysis")
         st.markdown("**Top Hiring Companies:**")
-        for company, count in report['top_companies'].items():
-            st.markdown(f"- **{company}:** {count} openings")
+        st.dataframe(
+            pd.Series(report['top_companies'], name='Openings', dtype='int64'),
+            use_container_width=True
+        )
     
     with tab4:
         st.subheader("Location Analysis")
-        for location, count in report['location_distribution'].items():
-            pct = count / report['total_jobs'] * 100
-            st.markdown(f"- **{location}:** {count} jobs ({pct:.1f}%)")
+        locations = report['location_distribution']
+        counts = np.fromiter(locations.values(), dtype=np.int64, count=len(locations))
+        pcts = counts * (100.0 / max(report['total_jobs'], 1))
+        location_df = pd.DataFrame({'Jobs': counts, 'Share': pcts}, index=pd.Index(list(locations), name='Location'))
+        st.dataframe(location_df.style.format({'Share': '{:.1f}%'}), use_container_width=True)
     
     # Download report
     st.divider()
     st.download_button(
         "📥 Download Full Report (JSON)",
-        data=str(report),
+        data=_report_json(analyzer, data_version),
         file_name="job_market_report.json",
         mime="application/json"
     )
@@ -5,9 +5,12 @@ Run this periodically to keep your database updated!
 Usage:
     python refresh_data.py          # Fetch real jobs
     python refresh_data.py --sample # Generate sample data instead
-    python refresh_data.py --clear  # Clear all data first
+    python refresh_data.py --clear  # Clear all data first (loads with bulk_ingest)
+    python refresh_data.py --bulk   # Unsafe fast load into the existing store
 """
 import argparse
+import logging
+import os
 from datetime import datetime
 
 from src.data_collection.collectors import SampleDataCollector, DataCollectionManager
@@ -16,14 +19,19 @@ from src.etl.database import JobDatabase
 from src.rag.vector_store import JobVectorStore
 
 
-def refresh_with_real_data(clear_first: bool = False):
-    """Fetch real jobs from APIs and update database."""
+def refresh_with_real_data(clear_first: bool = False, bulk: bool = False):
+    """
+    Fetch real jobs from APIs and update database.
+    
+    The vector store is loaded with bulk_ingest (no journal - a crash mid-load
+    can corrupt it) only when it's rebuilt from scratch or `bulk` is set.
+    """
     print("🌐 Fetching REAL job data from free APIs...")
     print("="*60)
     
     # Initialize
     db = JobDatabase()
-    vs = JobVectorStore()
+    vs = JobVectorStore(bulk_ingest=clear_first or bulk)
     
     if clear_first:
         print("🗑️ Clearing existing data...")
@@ -38,18 +46,21 @@ def refresh_with_real_data(clear_first: bool = False):
     ))
     manager.add_collector(ArbeitnowCollector(max_pages=5))
     
-    jobs = manager.collect_all()
+    jobs = manager.collect_all_list()
     
     if jobs:
         print(f"\n📥 Saving {len(jobs)} jobs to database...")
         inserted, skipped = db.insert_many(jobs)
         
-        print(f"\n📥 Adding to vector store...")
-        added, _ = vs.add_jobs(jobs)
+        print(f"\n📥 Embedding and adding to vector store...")
+        try:
+            added, _ = vs.add_jobs(jobs)
+        finally:
+            vs.finalize_bulk()
         
         print(f"\n✅ Refresh complete!")
         print(f"   Database: {inserted} new jobs added")
-        print(f"   Vector store: {added} new embeddings added")
+        print(f"   Vector store: {added} jobs embedded and stored")
         
         # Show stats
         stats = db.get_stats()
@@ -58,14 +69,14 @@ def refresh_with_real_data(clear_first: bool = False):
         print("❌ No jobs fetched. Check your internet connection.")
 
 
-def refresh_with_sample_data(num_jobs: int = 500, clear_first: bool = False):
-    """Generate sample data for testing."""
+def refresh_with_sample_data(num_jobs: int = 500, clear_first: bool = False, bulk: bool = False):
+    """Generate sample data for testing (bulk_ingest as in refresh_with_real_data)."""
     print(f"🎲 Generating {num_jobs} sample jobs...")
     print("="*60)
     
     # Initialize
     db = JobDatabase()
-    vs = JobVectorStore()
+    vs = JobVectorStore(bulk_ingest=clear_first or bulk)
     
     if clear_first:
         print("🗑️ Clearing existing data...")
@@ -74,36 +85,42 @@ def refresh_with_sample_data(num_jobs: int = 500, clear_first: bool = False):
     
     # Generate sample data
     manager = DataCollectionManager()
-    manager.add_collector(SampleDataCollector(num_jobs=num_jobs))
+    manager.add_collector(SampleDataCollector(num_jobs=num_jobs, workers=os.cpu_count() or 1))
     
-    jobs = manager.collect_all()
+    jobs = manager.collect_all_list()
     
     print(f"\n📥 Saving to database...")
     inserted, skipped = db.insert_many(jobs)
     
-    print(f"\n📥 Adding to vector store...")
-    added, _ = vs.add_jobs(jobs)
+    print(f"\n📥 Embedding and adding to vector store...")
+    try:
+        added, _ = vs.add_jobs(jobs)
+    finally:
+        vs.finalize_bulk()
     
     print(f"\n✅ Refresh complete!")
     print(f"   Database: {inserted} new jobs added")
-    print(f"   Vector store: {added} new embeddings added")
+    print(f"   Vector store: {added} jobs embedded and stored")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Refresh job market data")
     parser.add_argument("--sample", action="store_true", help="Use sample data instead of real APIs")
     parser.add_argument("--clear", action="store_true", help="Clear existing data before refresh")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Load the vector store without journaling even without --clear (faster; a crash can corrupt it)")
     parser.add_argument("--num", type=int, default=500, help="Number of sample jobs (only with --sample)")
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     
     print(f"\n🕐 Data refresh started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
     if args.sample:
-        refresh_with_sample_data(num_jobs=args.num, clear_first=args.clear)
+        refresh_with_sample_data(num_jobs=args.num, clear_first=args.clear, bulk=args.bulk)
     else:
-        refresh_with_real_data(clear_first=args.clear)
+        refresh_with_real_data(clear_first=args.clear, bulk=args.bulk)
     
     print(f"\n🕐 Completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
@@ -2,47 +2,168 @@
 AI Career Agent - Uses LLMs to provide personalized career advice.
 Supports multiple providers: Groq (FREE!) or Anthropic (paid).
 """
+import asyncio
+import logging
 import os
+import threading
+import weakref
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from dotenv import load_dotenv
 
+import numpy as np
+
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.rag.vector_store import JobVectorStore
 from src.etl.database import JobDatabase
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
+# Shown to the user when the LLM call fails (details go to the log)
+_ERROR_ANSWER = "Sorry, I encountered an error while generating an answer. Please try again."
+
+# One job in the LLM context; the salary line is only filled in when known
+_JOB_CONTEXT_TEMPLATE = (
+    "{i}. **{company}** - {level} position\n"
+    "   Location: {location}\n"
+    "   Skills: {skills}\n"
+    "{salary}"
+    "   Match Score: {score:.1%}\n"
+)
+_JOB_CONTEXT_HEADER = "Here are relevant job postings from our database:\n\n"
+
+
+# The event loop every sync -> async call runs on (started on first use)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def run_async(coro):
+    """
+    Run a coroutine on the shared background event loop and wait for its result.
+    Unlike asyncio.run() per call, the loop lives on - so the per-loop async LLM
+    client and the loop's worker threads (each with its own DB connection) are
+    created once and reused instead of piling up.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="agent-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+def _unit(vector) -> np.ndarray:
+    """Scale an embedding to length 1 (so blends and dot products are cosines)."""
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
 
 class LLMProvider:
-    """Base class for LLM providers."""
-    def generate(self, system: str, user_message: str) -> str:
+    """
+    Base class for LLM providers.
+    
+    Each provider maps a few "tiers" to concrete settings:
+    - instant: small fast model, short deterministic answers (quick actions)
+    - balanced: the full model for open-ended questions
+    """
+    TIERS: dict[str, dict] = {}
+    
+    def generate(self, system: str, user_message: str, tier: str = "balanced") -> str:
         raise NotImplementedError
+    
+    def stream(self, system: str, user_message: str, tier: str = "balanced") -> Iterator[str]:
+        """Yield the response text as it is generated (default: all at once)."""
+        yield self.generate(system, user_message, tier)
+    
+    async def agenerate(self, system: str, user_message: str, tier: str = "balanced") -> str:
+        """Async version of generate (default: run generate in a worker thread)."""
+        return await asyncio.to_thread(self.generate, system, user_message, tier)
+    
+    def warmup(self):
+        """Prime the HTTP connection (DNS + TLS) before the first real question."""
+        pass
+    
+    def _async_client(self, factory):
+        """
+        One async client per event loop - httpx connection pools can't be
+        shared across loops, but requests gathered on one loop share a pool.
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_clients:
+            self._async_clients[loop] = factory()
+        return self._async_clients[loop]
+    
+    def _tier(self, tier: str) -> dict:
+        """Look up the settings for a tier."""
+        if tier not in self.TIERS:
+            raise ValueError(f"Unknown tier: {tier}")
+        return self.TIERS[tier]
 
 
 class GroqProvider(LLMProvider):
     """FREE LLM provider using Groq API."""
     
+    TIERS = {
+        "instant": {"model": "llama-3.1-8b-instant", "max_tokens": 384, "temperature": 0},
+        "balanced": {"model": "llama-3.3-70b-versatile", "max_tokens": 1500, "temperature": 0.7},
+    }
+    
     def __init__(self):
         from groq import Groq
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
             raise ValueError("GROQ_API_KEY not found!")
+        self.api_key = api_key
         self.client = Groq(api_key=api_key)
-        self.model = "llama-3.3-70b-versatile"  # Free and powerful!
-        print(f"✅ Using Groq ({self.model}) - FREE!")
+        self._async_clients = weakref.WeakKeyDictionary()
+        self.model = self.TIERS["balanced"]["model"]  # Free and powerful!
+        logger.info("✅ Using Groq (%s) - FREE!", self.model)
     
-    def generate(self, system: str, user_message: str) -> str:
-        response = self.client.chat.completions.create(
-            model=self.model,
+    def _create(self, system: str, user_message: str, tier: str, stream: bool = False):
+        return self.client.chat.completions.create(
             messages=[
                 {"role": "system", "content": system},
                 {"role": "user", "content": user_message}
             ],
-            max_tokens=1500,
-            temperature=0.7
+            stream=stream,
+            **self._tier(tier)
+        )
+    
+    def warmup(self):
+        """A 1-token completion on the small model opens a pooled connection."""
+        self.client.chat.completions.create(
+            model=self.TIERS["instant"]["model"],
+            messages=[{"role": "user", "content": "ok"}],
+            max_tokens=1
+        )
+    
+    def generate(self, system: str, user_message: str, tier: str = "balanced") -> str:
+        response = self._create(system, user_message, tier)
+        return response.choices[0].message.content
+    
+    def stream(self, system: str, user_message: str, tier: str = "balanced") -> Iterator[str]:
+        for chunk in self._create(system, user_message, tier, stream=True):
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    
+    async def agenerate(self, system: str, user_message: str, tier: str = "balanced") -> str:
+        from groq import AsyncGroq
+        client = self._async_client(lambda: AsyncGroq(api_key=self.api_key))
+        response = await client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user_message}
+            ],
+            **self._tier(tier)
         )
         return response.choices[0].message.content
 
@@ -50,21 +171,50 @@ class GroqProvider(LLMProvider):
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude provider (paid)."""
     
+    TIERS = {
+        "instant": {"model": "claude-3-5-haiku-20241022", "max_tokens": 384, "temperature": 0},
+        "balanced": {"model": "claude-sonnet-4-20250514", "max_tokens": 1500, "temperature": 0.7},
+    }
+    
     def __init__(self):
         from anthropic import Anthropic
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not found!")
+        self.api_key = api_key
         self.client = Anthropic(api_key=api_key)
-        self.model = "claude-sonnet-4-20250514"
-        print(f"✅ Using Anthropic ({self.model})")
+        self._async_clients = weakref.WeakKeyDictionary()
+        self.model = self.TIERS["balanced"]["model"]
+        logger.info("✅ Using Anthropic (%s)", self.model)
     
-    def generate(self, system: str, user_message: str) -> str:
+    @staticmethod
+    def _system_blocks(system: str) -> list[dict]:
+        """Mark the system prompt as a cacheable prefix (prompt caching)."""
+        return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+    
+    def generate(self, system: str, user_message: str, tier: str = "balanced") -> str:
         response = self.client.messages.create(
-            model=self.model,
-            max_tokens=1500,
-            system=system,
-            messages=[{"role": "user", "content": user_message}]
+            system=self._system_blocks(system),
+            messages=[{"role": "user", "content": user_message}],
+            **self._tier(tier)
+        )
+        return response.content[0].text
+    
+    def stream(self, system: str, user_message: str, tier: str = "balanced") -> Iterator[str]:
+        with self.client.messages.stream(
+            system=self._system_blocks(system),
+            messages=[{"role": "user", "content": user_message}],
+            **self._tier(tier)
+        ) as response:
+            yield from response.text_stream
+    
+    async def agenerate(self, system: str, user_message: str, tier: str = "balanced") -> str:
+        from anthropic import AsyncAnthropic
+        client = self._async_client(lambda: AsyncAnthropic(api_key=self.api_key))
+        response = await client.messages.create(
+            system=self._system_blocks(system),
+            messages=[{"role": "user", "content": user_message}],
+            **self._tier(tier)
         )
         return response.content[0].text
 
@@ -86,21 +236,9 @@ class CareerAgent:
     AI-powered career advisor using RAG (Retrieval Augmented Generation).
     """
     
-    def __init__(
-        self,
-        vector_store: Optional[JobVectorStore] = None,
-        database: Optional[JobDatabase] = None,
-        llm_provider: Optional[LLMProvider] = None
-    ):
-        # Initialize LLM
-        self.llm = llm_provider or get_llm_provider()
-        
-        # Initialize data stores
-        self.vector_store = vector_store or JobVectorStore()
-        self.database = database or JobDatabase()
-        
-        # System prompt
-        self.system_prompt = """You are an expert AI Career Advisor with deep knowledge of the tech job market. 
+    # Shared by every agent and kept byte-identical between calls, so providers
+    # can cache it as a prompt prefix
+    SYSTEM_PROMPT = """You are an expert AI Career Advisor with deep knowledge of the tech job market. 
 
 Your role is to help job seekers by:
 1. Analyzing job market trends and data
@@ -118,12 +256,152 @@ When responding:
 - If you don't have enough data, be honest about it
 
 Remember: Your goal is to help people advance their careers!"""
+    
+    # How many answers to keep for repeated questions (temperature-0 tiers only)
+    ANSWER_CACHE_SIZE = 512
+    
+    # Retrieval cache: how many queries to keep, and how close (cosine) a new
+    # query must be to a cached one to reuse its jobs
+    RETRIEVAL_CACHE_SIZE = 512
+    SIMILAR_QUERY_THRESHOLD = 0.95
+    
+    # Templated questions retrieve with the fixed part of the template embedded
+    # once, blended with the embedding of just the variable part (the role)
+    TEMPLATE_PREFIXES = {
+        "market_analysis": "Please provide a comprehensive job market analysis for",
+        "skill_recommendations": "What additional skills should I learn to become a",
+    }
+    TEMPLATE_PREFIX_WEIGHT = 0.3
+    
+    def __init__(
+        self,
+        vector_store: Optional[JobVectorStore] = None,
+        database: Optional[JobDatabase] = None,
+        llm_provider: Optional[LLMProvider] = None,
+        warmup: bool = False
+    ):
+        """
+        Args:
+            vector_store / database / llm_provider: Use these instead of new ones
+            warmup: Prime the LLM connection in the background. This sends a real
+                (billed) 1-token request, so only long-running apps should ask for it
+        """
+        # Initialize LLM
+        self.llm = llm_provider or get_llm_provider()
+        
+        # Initialize data stores
+        self.vector_store = vector_store or JobVectorStore()
+        self.database = database or JobDatabase()
+        
+        # LRU cache of deterministic (temperature-0) answers, shared by every session
+        self._answer_cache: OrderedDict[tuple, str] = OrderedDict()
+        self._answer_cache_lock = threading.Lock()
+        
+        # Semantic cache of retrieved jobs: (query, n_results) -> (query embedding, jobs)
+        self._retrieval_cache: OrderedDict[tuple, tuple[np.ndarray, list[dict]]] = OrderedDict()
+        self._retrieval_cache_lock = threading.Lock()
+        self._retrieval_version = self._data_version()
+        
+        # (data version, formatted market stats) - the stats only change with the data
+        self._stats_context_cache: Optional[tuple[tuple, str]] = None
+        
+        # Template name -> unit embedding of its fixed prefix (filled on first use)
+        self._template_embeddings: dict[str, np.ndarray] = {}
+        
+        # Warm the LLM connection in the background so the first answer is faster
+        if warmup:
+            threading.Thread(target=self._warmup, daemon=True).start()
 
-        print("✅ Career Agent initialized")
+        logger.info("✅ Career Agent initialized")
+    
+    def _warmup(self):
+        try:
+            self.llm.warmup()
+        except Exception:
+            logger.warning("⚠️ LLM warmup failed", exc_info=True)
+    
+    def _data_version(self) -> tuple:
+        """Fingerprint of the jobs data (database and vector store), seeing other processes' writes too."""
+        return (self.database.data_version(), self.vector_store.data_version())
     
     def _get_relevant_jobs(self, query: str, n_results: int = 5) -> list[dict]:
         """Retrieve relevant jobs using semantic search."""
-        return self.vector_store.search(query, n_results=n_results)
+        return self._get_relevant_jobs_batch([query], n_results)[0]
+    
+    def _get_relevant_jobs_batch(self, queries: list[str], n_results: int = 5) -> list[list[dict]]:
+        """
+        Retrieve relevant jobs for several queries (one result list per query).
+        
+        Results are cached: an exact repeat of a query is free, and a query whose
+        embedding is nearly identical to a cached one (cosine >= threshold)
+        reuses that query's jobs. Whatever is left is embedded in one call and
+        searched in one batched vector store query.
+        """
+        keys = [(query.strip().lower(), n_results) for query in queries]
+        results: list[Optional[list[dict]]] = [None] * len(queries)
+        
+        version = self._data_version()
+        with self._retrieval_cache_lock:
+            # New data (from this process or a refresh_data.py run) makes every
+            # cached result stale
+            if self._retrieval_version != version:
+                self._retrieval_cache.clear()
+                self._retrieval_version = version
+            
+            for i, key in enumerate(keys):
+                hit = self._retrieval_cache.get(key)
+                if hit is not None:
+                    self._retrieval_cache.move_to_end(key)
+                    results[i] = hit[1]
+        
+        missing = [i for i, jobs in enumerate(results) if jobs is None]
+        if not missing:
+            return results
+        
+        embeddings = np.asarray(self.vector_store.embed([queries[i] for i in missing]), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms == 0, 1.0, norms)
+        
+        to_search = []
+        with self._retrieval_cache_lock:
+            candidates = [(k, v) for k, v in self._retrieval_cache.items() if k[1] == n_results]
+            if candidates:
+                similarities = np.stack([v[0] for _, v in candidates]) @ embeddings.T
+                best = similarities.argmax(axis=0)
+            for row, i in enumerate(missing):
+                if candidates and similarities[best[row], row] >= self.SIMILAR_QUERY_THRESHOLD:
+                    cached_key, (_, jobs) = candidates[best[row]]
+                    self._retrieval_cache.move_to_end(cached_key)
+                    results[i] = jobs
+                else:
+                    to_search.append((i, embeddings[row]))
+        
+        if to_search:
+            found = self.vector_store.search_batch_by_embedding(
+                [embedding.tolist() for _, embedding in to_search],
+                n_results=n_results
+            )
+            with self._retrieval_cache_lock:
+                for (i, embedding), jobs in zip(to_search, found):
+                    results[i] = jobs
+                    if self._retrieval_version != version:
+                        continue  # the data changed mid-search - don't cache it
+                    self._retrieval_cache[keys[i]] = (embedding, jobs)
+                    if len(self._retrieval_cache) > self.RETRIEVAL_CACHE_SIZE:
+                        self._retrieval_cache.popitem(last=False)
+        
+        return results
+    
+    def _get_template_jobs(self, template: str, variable: str, n_results: int = 5) -> list[dict]:
+        """Retrieve jobs for a templated question, embedding only its variable part."""
+        prefix = self._template_embeddings.get(template)
+        if prefix is None:
+            prefix = _unit(self.vector_store.embed([self.TEMPLATE_PREFIXES[template]])[0])
+            self._template_embeddings[template] = prefix
+        
+        weight = self.TEMPLATE_PREFIX_WEIGHT
+        query = (1 - weight) * _unit(self.vector_store.embed_query(variable)) + weight * prefix
+        return self.vector_store.search_by_embedding(_unit(query).tolist(), n_results=n_results)
     
     def _get_market_stats(self) -> dict:
         """Get current job market statistics."""
@@ -134,20 +412,32 @@ Remember: Your goal is to help people advance their careers!"""
         if not jobs:
             return "No relevant jobs found in the database."
         
-        lines = ["Here are relevant job postings from our database:\n"]
-        
+        blocks = []
         for i, job in enumerate(jobs, 1):
             meta = job['metadata']
-            lines.append(f"{i}. **{meta.get('company', 'Unknown')}** - {meta.get('experience_level', '')} position")
-            lines.append(f"   Location: {meta.get('location', 'Not specified')}")
-            lines.append(f"   Skills: {meta.get('skills', 'Not specified')}")
             sal_min, sal_max = meta.get('salary_min', 0), meta.get('salary_max', 0)
-            if sal_min and sal_max:
-                lines.append(f"   Salary: ${sal_min:,.0f} - ${sal_max:,.0f}")
-            lines.append(f"   Match Score: {job['similarity_score']:.1%}")
-            lines.append("")
+            blocks.append(_JOB_CONTEXT_TEMPLATE.format(
+                i=i,
+                company=meta.get('company', 'Unknown'),
+                level=meta.get('experience_level', ''),
+                location=meta.get('location', 'Not specified'),
+                skills=meta.get('skills', 'Not specified'),
+                salary=f"   Salary: ${sal_min:,.0f} - ${sal_max:,.0f}\n" if sal_min and sal_max else "",
+                score=job['similarity_score']
+            ))
         
-        return "\n".join(lines)
+        return _JOB_CONTEXT_HEADER + "\n".join(blocks)
+    
+    def _get_stats_context(self) -> str:
+        """Formatted market stats, rebuilt only when the database changes."""
+        version = self.database.data_version()
+        cached = self._stats_context_cache
+        if cached and cached[0] == version:
+            return cached[1]
+        
+        context = self._format_stats_context(self._get_market_stats())
+        self._stats_context_cache = (version, context)
+        return context
     
     def _format_stats_context(self, stats: dict) -> str:
         """Format market statistics for the AI context."""
@@ -155,12 +445,12 @@ Remember: Your goal is to help people advance their careers!"""
         lines.append(f"Total Jobs in Database: {stats.get('total_jobs', 0)}")
         
         if stats.get('top_skills'):
-            top_5 = list(stats['top_skills'].items())[:5]
+            top_5 = islice(stats['top_skills'].items(), 5)
             skills_str = ", ".join([f"{s[0]} ({s[1]} jobs)" for s in top_5])
             lines.append(f"Top Skills in Demand: {skills_str}")
         
         if stats.get('top_companies'):
-            top_5 = list(stats['top_companies'].items())[:5]
+            top_5 = islice(stats['top_companies'].items(), 5)
             companies_str = ", ".join([f"{c[0]} ({c[1]} openings)" for c in top_5])
             lines.append(f"Top Hiring Companies: {companies_str}")
         
@@ -178,21 +468,62 @@ Remember: Your goal is to help people advance their careers!"""
         
         return "\n".join(lines)
     
-    def ask(self, question: str, include_jobs: bool = True, include_stats: bool = True) -> str:
-        """Ask the career agent a question."""
+    def _format_history(self, history: list[dict]) -> str:
+        """Format the recent chat turns so follow-up questions keep their context."""
+        lines = ["Recent conversation:\n"]
+        for message in history:
+            speaker = "User" if message["role"] == "user" else "Advisor"
+            lines.append(f"{speaker}: {message['content']}")
+        return "\n".join(lines)
+    
+    def _answer_key(self, question: str, include_jobs: bool, include_stats: bool, tier: str) -> Optional[tuple]:
+        """
+        Cache key for an answer, or None if it shouldn't be cached. Only
+        temperature-0 tiers are cached - replaying one sampled answer would
+        hide that the others vary. Includes the database and vector store
+        versions, so a refresh of either invalidates it.
+        """
+        if self.llm.TIERS.get(tier, {}).get("temperature") != 0:
+            return None
+        return (question.strip().lower(), include_jobs, include_stats, tier, self._data_version())
+    
+    def _get_cached_answer(self, key: tuple) -> Optional[str]:
+        with self._answer_cache_lock:
+            answer = self._answer_cache.get(key)
+            if answer is not None:
+                self._answer_cache.move_to_end(key)
+            return answer
+    
+    def _cache_answer(self, key: tuple, answer: str):
+        with self._answer_cache_lock:
+            self._answer_cache[key] = answer
+            self._answer_cache.move_to_end(key)
+            if len(self._answer_cache) > self.ANSWER_CACHE_SIZE:
+                self._answer_cache.popitem(last=False)
+    
+    def _build_user_message(
+        self,
+        question: str,
+        include_jobs: bool,
+        include_stats: bool,
+        history: Optional[list[dict]] = None
+    ) -> str:
+        """Gather the RAG context and wrap it around the question."""
         context_parts = []
         
+        if history:
+            context_parts.append(self._format_history(history))
+        
         if include_jobs:
             relevant_jobs = self._get_relevant_jobs(question)
             context_parts.append(self._format_jobs_context(relevant_jobs))
         
         if include_stats:
-            stats = self._get_market_stats()
-            context_parts.append(self._format_stats_context(stats))
+            context_parts.append(self._get_stats_context())
         
         context = "\n\n---\n\n".join(context_parts)
         
-        user_message = f"""Based on the following job market data, please answer this question:
+        return f"""Based on the following job market data, please answer this question:
 
 **Question:** {question}
 
@@ -205,11 +536,96 @@ Remember: Your goal is to help people advance their careers!"""
 ---
 
 Please provide helpful, data-driven career advice based on the above information."""
-
+    
+    def ask(
+        self,
+        question: str,
+        include_jobs: bool = True,
+        include_stats: bool = True,
+        tier: str = "balanced",
+        history: Optional[list[dict]] = None
+    ) -> str:
+        """
+        Ask the career agent a question.
+        
+        Args:
+            tier: "instant" for short quick-action answers, "balanced" for full questions
+            history: Recent chat messages ({"role", "content"}) - keep this short,
+                     it goes into every prompt. Answers with history aren't cached
+                     (nor are answers from tiers with a non-zero temperature).
+        """
+        key = None if history else self._answer_key(question, include_jobs, include_stats, tier)
+        cached = self._get_cached_answer(key) if key else None
+        if cached is not None:
+            return cached
+        
+        user_message = self._build_user_message(question, include_jobs, include_stats, history)
+        
         try:
-            return self.llm.generate(self.system_prompt, user_message)
-        except Exception as e:
-            return f"Sorry, I encountered an error: {str(e)}"
+            answer = self.llm.generate(self.SYSTEM_PROMPT, user_message, tier)
+        except Exception:
+            logger.exception("LLM call failed")
+            return _ERROR_ANSWER
+        
+        if key:
+            self._cache_answer(key, answer)
+        return answer
+    
+    def ask_stream(
+        self,
+        question: str,
+        include_jobs: bool = True,
+        include_stats: bool = True,
+        tier: str = "balanced",
+        history: Optional[list[dict]] = None
+    ) -> Iterator[str]:
+        """Ask the career agent a question, yielding the answer as it is generated."""
+        key = None if history else self._answer_key(question, include_jobs, include_stats, tier)
+        cached = self._get_cached_answer(key) if key else None
+        if cached is not None:
+            yield cached
+            return
+        
+        user_message = self._build_user_message(question, include_jobs, include_stats, history)
+        
+        chunks = []
+        try:
+            for chunk in self.llm.stream(self.SYSTEM_PROMPT, user_message, tier):
+                chunks.append(chunk)
+                yield chunk
+        except Exception:
+            logger.exception("LLM call failed")
+            yield _ERROR_ANSWER
+            return
+        
+        if key:
+            self._cache_answer(key, "".join(chunks))
+    
+    async def ask_async(
+        self,
+        question: str,
+        include_jobs: bool = True,
+        include_stats: bool = True,
+        tier: str = "balanced"
+    ) -> str:
+        """Async version of ask() - lets several questions run concurrently."""
+        key = self._answer_key(question, include_jobs, include_stats, tier)
+        cached = self._get_cached_answer(key) if key else None
+        if cached is not None:
+            return cached
+        
+        # Retrieval is blocking (ChromaDB/SQLite), so keep it off the event loop
+        user_message = await asyncio.to_thread(self._build_user_message, question, include_jobs, include_stats)
+        
+        try:
+            answer = await self.llm.agenerate(self.SYSTEM_PROMPT, user_message, tier)
+        except Exception:
+            logger.exception("LLM call failed")
+            return _ERROR_ANSWER
+        
+        if key:
+            self._cache_answer(key, answer)
+        return answer
     
     def get_skill_recommendations(self, current_skills: list[str], target_role: str) -> str:
         """Get personalized skill recommendations."""
@@ -217,8 +633,10 @@ Please provide helpful, data-driven career advice based on the above information
         
 I want to become a {target_role}. 
 
-What additional skills should I learn? Please prioritize them by importance."""
-        return self.ask(question)
+What additional skills should I learn? Please prioritize them by importance.
+
+{self._format_jobs_context(self._get_template_jobs("skill_recommendations", target_role))}"""
+        return self.ask(question, include_jobs=False)
     
     def analyze_job_market(self, role: str) -> str:
         """Get a comprehensive job market analysis for a specific role."""
@@ -229,13 +647,18 @@ What additional skills should I learn? Please prioritize them by importance."""
 3. Salary ranges by experience level
 4. Top hiring companies
 5. Remote work opportunities
-6. Career growth path"""
-        return self.ask(question)
+6. Career growth path
+
+{self._format_jobs_context(self._get_template_jobs("market_analysis", role))}"""
+        return self.ask(question, include_jobs=False)
     
     def compare_roles(self, role1: str, role2: str) -> str:
         """Compare two career paths."""
-        jobs1 = self._get_relevant_jobs(role1, n_results=10)
-        jobs2 = self._get_relevant_jobs(role2, n_results=10)
+        return run_async(self.compare_roles_async(role1, role2))
+    
+    async def compare_roles_async(self, role1: str, role2: str) -> str:
+        """Async version of compare_roles() - both roles are retrieved in one batched search."""
+        jobs1, jobs2 = await asyncio.to_thread(self._get_relevant_jobs_batch, [role1, role2], 10)
         
         question = f"""Compare these two career paths:
 
@@ -246,11 +669,12 @@ What additional skills should I learn? Please prioritize them by importance."""
 {self._format_jobs_context(jobs2)}
 
 Compare on: salary, job availability, skills, growth, remote options."""
-        return self.ask(question, include_jobs=False, include_stats=True)
+        return await self.ask_async(question, include_jobs=False, include_stats=True)
 
 
 # Test the agent
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("🚀 Testing Career Agent\n")
     print("="*60)
     
@@ -270,8 +694,10 @@ if __name__ == "__main__":
     print(f"Question: {question}")
     print("="*60)
     
-    response = agent.ask(question)
-    print(f"\n{response}")
+    print()
+    for token in agent.ask_stream(question):
+        print(token, end="", flush=True)
+    print()
     
     print("\n" + "="*60)
     print("🎉 Career Agent test complete!")
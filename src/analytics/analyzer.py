@@ -2,46 +2,58 @@
 Analytics Engine - Generates insights and statistics from job data.
 Used by both the AI agent and the web interface.
 """
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from pathlib import Path
 from typing import Optional
-from collections import Counter
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.etl.database import JobDatabase
 
+logger = logging.getLogger(__name__)
+
 
 class JobAnalyzer:
     """
     Analyzes job market data and generates insights.
     """
     
+    # Seconds a generated market report stays valid (if the data doesn't change first)
+    REPORT_TTL = 180
+    
+    # Threads running the report's SQL aggregations in parallel
+    REPORT_WORKERS = 5
+    
     def __init__(self, database: Optional[JobDatabase] = None):
         self.db = database or JobDatabase()
-        print("✅ Job Analyzer initialized")
+        
+        # (data version, DataFrame) - shared by every method until the data changes
+        self._df_cache: Optional[tuple[tuple, pd.DataFrame]] = None
+        
+        # (data version, generated at, report)
+        self._report_cache: Optional[tuple[tuple, float, dict]] = None
+        
+        # Long-lived, so its threads (and each one's database connection) are
+        # reused by every report instead of being opened per build
+        self._report_pool = ThreadPoolExecutor(max_workers=self.REPORT_WORKERS, thread_name_prefix="report")
+        logger.info("✅ Job Analyzer initialized")
     
     def get_jobs_dataframe(self) -> pd.DataFrame:
-        """Get all jobs as a pandas DataFrame for analysis."""
-        jobs = self.db.get_all_jobs(limit=10000)
-        
-        data = []
-        for job in jobs:
-            data.append({
-                'id': job.id,
-                'title': job.title,
-                'company': job.company,
-                'location': job.location,
-                'salary_min': job.salary_min,
-                'salary_max': job.salary_max,
-                'experience_level': job.experience_level,
-                'remote': job.remote,
-                'skills': job.skills,
-                'posted_date': job.posted_date,
-                'source': job.source
-            })
+        """
+        Get all jobs as a pandas DataFrame for analysis.
+        The DataFrame is cached until the database changes, so treat it as
+        read-only (derive new columns as separate Series).
+        """
+        version = self.db.data_version()
+        if self._df_cache and self._df_cache[0] == version:
+            return self._df_cache[1]
         
-        return pd.DataFrame(data)
+        df = self.db.jobs_dataframe(limit=10000)
+        self._df_cache = (version, df)
+        return df
     
     def get_skill_demand(self, top_n: int = 20) -> dict:
         """Get the most in-demand skills."""
@@ -56,72 +68,15 @@ class JobAnalyzer:
     
     def get_salary_by_role(self) -> dict:
         """Get average salaries by job role/title."""
-        df = self.get_jobs_dataframe()
-        
-        # Extract base role from title
-        def get_base_role(title):
-            title_lower = title.lower()
-            if 'data engineer' in title_lower:
-                return 'Data Engineer'
-            elif 'machine learning' in title_lower or 'ml engineer' in title_lower:
-                return 'ML Engineer'
-            elif 'ai engineer' in title_lower:
-                return 'AI Engineer'
-            elif 'data scientist' in title_lower:
-                return 'Data Scientist'
-            elif 'backend' in title_lower:
-                return 'Backend Engineer'
-            elif 'full stack' in title_lower or 'fullstack' in title_lower:
-                return 'Full Stack Engineer'
-            elif 'devops' in title_lower or 'sre' in title_lower:
-                return 'DevOps Engineer'
-            elif 'analytics' in title_lower:
-                return 'Analytics Engineer'
-            else:
-                return 'Other'
-        
-        df['role'] = df['title'].apply(get_base_role)
-        
-        salary_by_role = df.groupby('role').agg({
-            'salary_min': 'mean',
-            'salary_max': 'mean'
-        }).round(0).to_dict('index')
-        
-        return salary_by_role
+        return self.db.salary_by_role()
     
     def get_top_companies(self, top_n: int = 10) -> dict:
         """Get companies with most job openings."""
-        stats = self.db.get_stats()
-        return dict(list(stats.get('top_companies', {}).items())[:top_n])
+        return self.db.top_companies(top_n)
     
     def get_location_distribution(self) -> dict:
         """Get job distribution by location."""
-        df = self.get_jobs_dataframe()
-        
-        # Simplify locations
-        def simplify_location(loc):
-            if not loc:
-                return 'Unknown'
-            loc_lower = loc.lower()
-            if 'remote' in loc_lower:
-                return 'Remote'
-            elif 'san francisco' in loc_lower or 'sf' in loc_lower:
-                return 'San Francisco'
-            elif 'new york' in loc_lower or 'nyc' in loc_lower:
-                return 'New York'
-            elif 'seattle' in loc_lower:
-                return 'Seattle'
-            elif 'austin' in loc_lower:
-                return 'Austin'
-            elif 'los angeles' in loc_lower or 'la' in loc_lower:
-                return 'Los Angeles'
-            else:
-                return loc.split(',')[0]  # Just city name
-        
-        df['simple_location'] = df['location'].apply(simplify_location)
-        location_counts = df['simple_location'].value_counts().head(10).to_dict()
-        
-        return location_counts
+        return self.db.location_counts(10)
     
     def get_remote_stats(self) -> dict:
         """Get remote vs on-site statistics."""
@@ -146,97 +101,83 @@ class JobAnalyzer:
     
     def get_skill_salary_correlation(self) -> dict:
         """Analyze which skills correlate with higher salaries."""
-        df = self.get_jobs_dataframe()
-        
-        # Calculate average salary for each skill
-        skill_salaries = {}
-        
-        for _, row in df.iterrows():
-            if row['salary_max'] and row['skills']:
-                avg_salary = (row['salary_min'] + row['salary_max']) / 2
-                for skill in row['skills']:
-                    if skill not in skill_salaries:
-                        skill_salaries[skill] = []
-                    skill_salaries[skill].append(avg_salary)
-        
-        # Calculate averages
-        skill_avg_salary = {
-            skill: round(sum(salaries) / len(salaries), 0)
-            for skill, salaries in skill_salaries.items()
-            if len(salaries) >= 5  # Only skills with enough data
-        }
-        
-        # Sort by salary
-        sorted_skills = dict(sorted(
-            skill_avg_salary.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:15])
-        
-        return sorted_skills
+        # Only skills with enough data (5+ salaried jobs), top 15
+        return self.db.skill_salaries(min_count=5, n=15)
     
     def get_trending_skills(self) -> dict:
         """
         Identify trending skills based on recent job postings.
         In a real scenario, this would compare recent vs older data.
         """
-        # For now, return skills weighted by recency
-        df = self.get_jobs_dataframe()
-        df = df.sort_values('posted_date', ascending=False)
+        # For now, return the top skills of the most recent 50% of jobs
+        return self.db.trending_skills(10)
+    
+    def generate_market_report(self) -> dict:
+        """
+        Generate a comprehensive market report.
+        Cached for REPORT_TTL seconds; writes to the database invalidate it sooner.
+        """
+        version = self.db.data_version()
+        if self._report_cache:
+            cached_version, generated_at, report = self._report_cache
+            if cached_version == version and time.monotonic() - generated_at < self.REPORT_TTL:
+                return report
         
-        # Get skills from most recent 50% of jobs
-        recent_df = df.head(len(df) // 2)
+        report = self._build_market_report()
+        self._report_cache = (version, time.monotonic(), report)
+        return report
+    
+    def _build_market_report(self) -> dict:
+        """
+        Compute every section of the market report.
+        The independent SQL aggregations run in parallel on the report pool
+        (each worker thread keeps its own connection, and SQLite releases the
+        GIL while it works).
+        """
+        sql_sections = {
+            'salary_by_role': self.get_salary_by_role,
+            'top_companies': lambda: self.get_top_companies(10),
+            'location_distribution': self.get_location_distribution,
+            'highest_paying_skills': self.get_skill_salary_correlation,
+            'trending_skills': self.get_trending_skills,
+        }
         
-        recent_skills = []
-        for skills in recent_df['skills']:
-            if skills:
-                recent_skills.extend(skills)
+        futures = {name: self._report_pool.submit(fn) for name, fn in sql_sections.items()}
         
-        skill_counts = Counter(recent_skills)
-        return dict(skill_counts.most_common(10))
-    
-    def generate_market_report(self) -> dict:
-        """Generate a comprehensive market report."""
-        return {
+        # Everything else comes from get_stats() (one cached query set)
+        report = {
             'total_jobs': self.db.get_stats().get('total_jobs', 0),
             'top_skills': self.get_skill_demand(10),
             'salary_by_experience': self.get_salary_by_experience(),
-            'salary_by_role': self.get_salary_by_role(),
-            'top_companies': self.get_top_companies(10),
-            'location_distribution': self.get_location_distribution(),
             'remote_stats': self.get_remote_stats(),
             'experience_distribution': self.get_experience_distribution(),
-            'highest_paying_skills': self.get_skill_salary_correlation(),
-            'trending_skills': self.get_trending_skills()
         }
+        report.update({name: future.result() for name, future in futures.items()})
+        
+        return report
     
     def get_role_comparison(self, role1: str, role2: str) -> dict:
         """Compare two roles side by side."""
         df = self.get_jobs_dataframe()
         
-        def filter_role(title, role):
-            return role.lower() in title.lower()
-        
-        df1 = df[df['title'].apply(lambda x: filter_role(x, role1))]
-        df2 = df[df['title'].apply(lambda x: filter_role(x, role2))]
+        # Vectorized, case-insensitive substring match (a title can match both roles)
+        df1 = df[df['title'].str.contains(role1, case=False, regex=False, na=False)]
+        df2 = df[df['title'].str.contains(role2, case=False, regex=False, na=False)]
         
         def get_role_stats(role_df, role_name):
             if len(role_df) == 0:
                 return {'role': role_name, 'count': 0}
             
-            # Collect all skills
-            all_skills = []
-            for skills in role_df['skills']:
-                if skills:
-                    all_skills.extend(skills)
+            means = role_df[['salary_min', 'salary_max', 'remote']].mean()
+            top_skills = role_df['skills'].explode().dropna().value_counts().head(5)
             
             return {
                 'role': role_name,
                 'count': len(role_df),
-                'avg_salary_min': round(role_df['salary_min'].mean(), 0),
-                'avg_salary_max': round(role_df['salary_max'].mean(), 0),
-                'remote_percentage': round(role_df['remote'].mean() * 100, 1),
-                'top_skills': dict(Counter(all_skills).most_common(5))
+                'avg_salary_min': round(means['salary_min'], 0),
+                'avg_salary_max': round(means['salary_max'], 0),
+                'remote_percentage': round(means['remote'] * 100, 1),
+                'top_skills': top_skills.to_dict()
             }
         
         return {
@@ -247,6 +188,7 @@ class JobAnalyzer:
 
 # Test the analyzer
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("🚀 Testing Analytics Engine\n")
     print("="*60)
     
@@ -2,14 +2,54 @@
 Data models for job postings.
 Think of these as blueprints that define what a "job posting" looks like.
 """
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
-import hashlib
+from typing import Mapping, Optional
+import itertools
 import json
+import os
+import re
+import secrets
 
 
-@dataclass
+def _reset_id_source():
+    """Random 32-bit prefix per process + a counter = unique 16-char hex ids."""
+    global _id_prefix, _id_counter
+    _id_prefix = secrets.randbits(32)
+    _id_counter = itertools.count()
+
+
+_reset_id_source()
+# A forked child would otherwise continue the parent's sequence
+os.register_at_fork(after_in_child=_reset_id_source)
+
+
+# Tech skills we look for in job descriptions (lowercase)
+COMMON_SKILLS = (
+    'python', 'javascript', 'java', 'c++', 'sql', 'aws', 'azure',
+    'docker', 'kubernetes', 'react', 'node.js', 'typescript',
+    'machine learning', 'deep learning', 'nlp', 'computer vision',
+    'tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn',
+    'git', 'linux', 'agile', 'scrum', 'api', 'rest', 'graphql',
+    'postgresql', 'mongodb', 'redis', 'elasticsearch', 'spark',
+    'airflow', 'kafka', 'ci/cd', 'jenkins', 'terraform',
+    'langchain', 'llm', 'rag', 'openai', 'anthropic', 'gpt',
+    'data engineering', 'data science', 'analytics', 'etl',
+    'power bi', 'tableau', 'excel', 'statistics', 'a/b testing'
+)
+
+# One pass over the text: at every position, the longest skill starting there.
+# (Zero-width lookahead, so matches can overlap - 'sql' inside 'postgresql' is found.)
+_SKILL_RE = re.compile(
+    "(?=(" + "|".join(re.escape(s) for s in sorted(COMMON_SKILLS, key=len, reverse=True)) + "))"
+)
+
+# A match also means every shorter skill inside it is present
+# (e.g. 'javascript' -> 'java', 'postgresql' -> 'sql')
+_IMPLIED_SKILLS = {s: {t for t in COMMON_SKILLS if t in s} for s in COMMON_SKILLS}
+
+
+@dataclass(slots=True)
 class JobPosting:
     """
     Represents a single job posting.
@@ -41,19 +81,31 @@ class JobPosting:
     
     def __post_init__(self):
         """Generate unique ID after creating the job posting."""
-        import uuid
-        # Create a unique ID using UUID + content hash for guaranteed uniqueness
-        content = f"{self.title}{self.company}{self.location}{uuid.uuid4()}"
-        self.id = hashlib.md5(content.encode()).hexdigest()[:16]
+        # Process prefix + sequence number: unique without hashing or OS randomness per job
+        self.id = f"{_id_prefix:08x}{next(_id_counter) & 0xFFFFFFFF:08x}"
     
     def to_dict(self) -> dict:
         """Convert to dictionary (useful for saving to database)."""
-        data = asdict(self)
-        # Convert datetime to string for JSON compatibility
-        if self.posted_date:
-            data['posted_date'] = self.posted_date.isoformat()
-        data['scraped_at'] = self.scraped_at.isoformat()
-        return data
+        # Built by hand - asdict() deep-copies every field through a recursive walk.
+        # Datetimes become strings for JSON compatibility.
+        return {
+            'title': self.title,
+            'company': self.company,
+            'location': self.location,
+            'description': self.description,
+            'salary_min': self.salary_min,
+            'salary_max': self.salary_max,
+            'salary_currency': self.salary_currency,
+            'job_type': self.job_type,
+            'experience_level': self.experience_level,
+            'remote': self.remote,
+            'skills': list(self.skills),
+            'source': self.source,
+            'url': self.url,
+            'posted_date': self.posted_date.isoformat() if self.posted_date else None,
+            'scraped_at': self.scraped_at.isoformat(),
+            'id': self.id,
+        }
     
     def to_json(self) -> str:
         """Convert to JSON string."""
@@ -72,27 +124,38 @@ class JobPosting:
         data.pop('id', None)
         return cls(**data)
     
+    @classmethod
+    def from_row(cls, row: Mapping, skills: list) -> 'JobPosting':
+        """
+        Rebuild a stored job (e.g. a sqlite3.Row) without going through
+        __init__: no defaults to fill, no new id drawn - the stored id is kept.
+        """
+        job = cls.__new__(cls)
+        job.id = row['id']
+        job.title = row['title']
+        job.company = row['company']
+        job.location = row['location']
+        job.description = row['description']
+        job.salary_min = row['salary_min']
+        job.salary_max = row['salary_max']
+        job.salary_currency = row['salary_currency']
+        job.job_type = row['job_type']
+        job.experience_level = row['experience_level']
+        job.remote = bool(row['remote'])
+        job.skills = skills
+        job.source = row['source']
+        job.url = row['url']
+        job.posted_date = datetime.fromisoformat(row['posted_date']) if row['posted_date'] else None
+        job.scraped_at = datetime.fromisoformat(row['scraped_at']) if row['scraped_at'] else datetime.now()
+        return job
+    
     def extract_skills_from_description(self) -> list:
         """
         Extract common tech skills from job description.
         This is a simple version - we'll make it smarter later!
         """
-        common_skills = [
-            'python', 'javascript', 'java', 'c++', 'sql', 'aws', 'azure',
-            'docker', 'kubernetes', 'react', 'node.js', 'typescript',
-            'machine learning', 'deep learning', 'nlp', 'computer vision',
-            'tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn',
-            'git', 'linux', 'agile', 'scrum', 'api', 'rest', 'graphql',
-            'postgresql', 'mongodb', 'redis', 'elasticsearch', 'spark',
-            'airflow', 'kafka', 'ci/cd', 'jenkins', 'terraform',
-            'langchain', 'llm', 'rag', 'openai', 'anthropic', 'gpt',
-            'data engineering', 'data science', 'analytics', 'etl',
-            'power bi', 'tableau', 'excel', 'statistics', 'a/b testing'
-        ]
-        
-        desc_lower = self.description.lower()
-        found = [s for s in common_skills if s in desc_lower]
-        self.skills = list(set(found))  # Remove duplicates
+        matches = _SKILL_RE.findall(self.description.lower())
+        self.skills = list(set().union(*map(_IMPLIED_SKILLS.__getitem__, matches)))
         return self.skills
 
 
@@ -6,17 +6,124 @@ Sources used:
 2. Arbeitnow API (FREE) - Tech jobs in Europe/US
 3. GitHub Jobs (via alternative) - Developer jobs
 """
+import asyncio
+import logging
+import re
+import httpx
+import orjson
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.data_collection.models import JobPosting
 from src.data_collection.collectors import BaseCollector
 
+logger = logging.getLogger(__name__)
+
+
+def _build_session() -> requests.Session:
+    """
+    HTTP session shared by all collectors.
+    Keeps connections alive between pages (no new TLS handshake per request)
+    and retries transient failures with backoff.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _build_session()
+
+
+class RateLimiter:
+    """
+    Spaces out requests so at most `rate` start per second - shared by all
+    threads hitting the same API, so fetching in parallel stays polite.
+    """
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Claim the next free slot; returns how long to wait for it."""
+        with self._lock:
+            slot = max(time.monotonic(), self._next_slot)
+            self._next_slot = slot + self.interval
+        return slot - time.monotonic()
+    
+    def wait(self):
+        """Block until this caller's slot comes up."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def wait_async(self):
+        """Same as wait(), without blocking the event loop."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _get_json(url: str, params: dict, limiter: RateLimiter) -> dict:
+    """
+    Rate-limited GET on the shared session, returning the decoded JSON body.
+    Raises requests.RequestException, or ValueError (orjson.JSONDecodeError)
+    when the body isn't JSON - e.g. an HTML error page.
+    """
+    limiter.wait()
+    response = SESSION.get(url, params=params, timeout=30)
+    response.raise_for_status()
+    return orjson.loads(response.content)  # much faster than response.json() on big pages
+
+
+async def _aget_json(client: httpx.AsyncClient, url: str, params: dict, limiter: RateLimiter) -> dict:
+    """Async version of _get_json on a caller-owned httpx client (raises httpx.HTTPError or ValueError)."""
+    await limiter.wait_async()
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+# Compiled once - "$100,000 - $150,000", "100k-150k", ...
+# Must start with a digit, so lone commas never match; "k" is captured separately
+_SALARY_RE = re.compile(r'(\d[\d,]*)(k?)')
+
+
+def _keyword_re(keywords: tuple) -> re.Pattern:
+    """One compiled alternation - finds any of `keywords` in a single scan of the text."""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+def _guess_experience_level(title: str, senior_re: re.Pattern, entry_re: re.Pattern) -> str:
+    """Guess experience level from job title (lowercased once, most specific level first)."""
+    title_lower = title.lower()
+    
+    if senior_re.search(title_lower):
+        if 'principal' in title_lower or 'staff' in title_lower:
+            return 'Principal'
+        elif 'lead' in title_lower:
+            return 'Lead'
+        return 'Senior'
+    elif entry_re.search(title_lower):
+        return 'Entry'
+    else:
+        return 'Mid'
+
 
 class RemotiveCollector(BaseCollector):
     """
@@ -39,6 +146,14 @@ class RemotiveCollector(BaseCollector):
         "qa"
     ]
     
+    # Title fragments that mark seniority
+    SENIOR_RE = _keyword_re(('senior', 'sr.', 'sr ', 'lead', 'principal', 'staff'))
+    ENTRY_RE = _keyword_re(('junior', 'jr.', 'jr ', 'entry', 'associate', 'intern'))
+    
+    # Categories are fetched in parallel, but all instances share one limiter
+    MAX_WORKERS = 4
+    RATE_LIMITER = RateLimiter(rate=2)
+    
     def __init__(self, categories: list = None, limit_per_category: int = 50):
         """
         Initialize collector.
@@ -53,32 +168,67 @@ class RemotiveCollector(BaseCollector):
     def collect(self) -> Generator[JobPosting, None, None]:
         """Fetch real remote jobs from Remotive API."""
         
-        for category in self.categories:
-            print(f"  📥 Fetching {category} jobs from Remotive...")
-            
-            try:
-                response = requests.get(
-                    self.BASE_URL,
-                    params={"category": category, "limit": self.limit},
-                    timeout=30
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                jobs = data.get("jobs", [])
-                print(f"     Found {len(jobs)} jobs")
-                
+        # Requests overlap; results still come back in category order
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            for jobs in executor.map(self._fetch_category, self.categories):
                 for job_data in jobs:
                     job = self._parse_job(job_data)
                     if job:
                         yield job
-                
-                # Be nice to the API
-                time.sleep(1)
-                
-            except requests.RequestException as e:
-                print(f"     ❌ Error fetching {category}: {e}")
-                continue
+    
+    def _fetch_category(self, category: str) -> list[dict]:
+        """Raw job dicts for one category (empty on error)."""
+        logger.info("  📥 Fetching %s jobs from Remotive...", category)
+        
+        try:
+            data = _get_json(
+                self.BASE_URL,
+                {"category": category, "limit": self.limit},
+                self.RATE_LIMITER
+            )
+        except (requests.RequestException, ValueError) as e:  # ValueError: body isn't JSON
+            logger.warning("     ❌ Error fetching %s: %s", category, e)
+            return []
+        
+        jobs = data.get("jobs", [])
+        logger.info("     Found %d jobs", len(jobs))
+        return jobs
+    
+    async def collect_async(self) -> AsyncGenerator[JobPosting, None]:
+        """
+        Async version of collect(): every category is requested on one event
+        loop (still through the shared rate limiter) and jobs are yielded as
+        soon as their category arrives.
+        """
+        async with httpx.AsyncClient(timeout=30) as client:
+            tasks = [
+                asyncio.ensure_future(self._fetch_category_async(client, category))
+                for category in self.categories
+            ]
+            for next_done in asyncio.as_completed(tasks):
+                for job_data in await next_done:
+                    job = self._parse_job(job_data)
+                    if job:
+                        yield job
+    
+    async def _fetch_category_async(self, client: httpx.AsyncClient, category: str) -> list[dict]:
+        """Async version of _fetch_category."""
+        logger.info("  📥 Fetching %s jobs from Remotive...", category)
+        
+        try:
+            data = await _aget_json(
+                client,
+                self.BASE_URL,
+                {"category": category, "limit": self.limit},
+                self.RATE_LIMITER
+            )
+        except (httpx.HTTPError, ValueError) as e:  # ValueError: body isn't JSON
+            logger.warning("     ❌ Error fetching %s: %s", category, e)
+            return []
+        
+        jobs = data.get("jobs", [])
+        logger.info("     Found %d jobs", len(jobs))
+        return jobs
     
     def _parse_job(self, data: dict) -> JobPosting:
         """Convert API response to JobPosting."""
@@ -121,8 +271,8 @@ class RemotiveCollector(BaseCollector):
             
             return job
             
-        except Exception as e:
-            print(f"     ⚠️ Error parsing job: {e}")
+        except Exception:
+            logger.exception("     ⚠️ Error parsing job")
             return None
     
     def _parse_salary(self, salary_text: str) -> tuple:
@@ -130,24 +280,16 @@ class RemotiveCollector(BaseCollector):
         if not salary_text:
             return None, None
         
-        import re
         # Look for patterns like "$100,000 - $150,000" or "100k-150k"
-        numbers = re.findall(r'[\d,]+(?:k)?', salary_text.lower())
+        numbers = _SALARY_RE.findall(salary_text.lower())
         
         parsed = []
-        for num in numbers:
-            num = num.replace(",", "")
-            if num.endswith('k'):
-                parsed.append(float(num[:-1]) * 1000)
-            else:
-                try:
-                    val = float(num)
-                    # If it's a small number, assume it's in thousands
-                    if val < 1000:
-                        val *= 1000
-                    parsed.append(val)
-                except:
-                    continue
+        for digits, thousands in numbers:
+            val = float(digits.replace(",", ""))
+            # "k" suffix, or a small number - assume it's in thousands
+            if thousands or val < 1000:
+                val *= 1000
+            parsed.append(val)
         
         if len(parsed) >= 2:
             return min(parsed), max(parsed)
@@ -158,18 +300,7 @@ class RemotiveCollector(BaseCollector):
     
     def _guess_experience_level(self, title: str) -> str:
         """Guess experience level from job title."""
-        title_lower = title.lower()
-        
-        if any(x in title_lower for x in ['senior', 'sr.', 'sr ', 'lead', 'principal', 'staff']):
-            if 'principal' in title_lower or 'staff' in title_lower:
-                return 'Principal'
-            elif 'lead' in title_lower:
-                return 'Lead'
-            return 'Senior'
-        elif any(x in title_lower for x in ['junior', 'jr.', 'jr ', 'entry', 'associate', 'intern']):
-            return 'Entry'
-        else:
-            return 'Mid'
+        return _guess_experience_level(title, self.SENIOR_RE, self.ENTRY_RE)
 
 
 class ArbeitnowCollector(BaseCollector):
@@ -181,6 +312,19 @@ class ArbeitnowCollector(BaseCollector):
     source_name = "arbeitnow"
     BASE_URL = "https://www.arbeitnow.com/api/job-board-api"
     
+    SENIOR_RE = _keyword_re(('senior', 'sr.', 'lead', 'principal', 'staff'))
+    ENTRY_RE = _keyword_re(('junior', 'jr.', 'entry', 'intern'))
+    
+    MAX_WORKERS = 4
+    RATE_LIMITER = RateLimiter(rate=2)
+    
+    TECH_RE = _keyword_re((
+        'developer', 'engineer', 'programmer', 'software', 'data',
+        'devops', 'cloud', 'python', 'java', 'javascript', 'backend',
+        'frontend', 'fullstack', 'machine learning', 'ai ', 'ml ',
+        'analyst', 'architect', 'security', 'database', 'api'
+    ))
+    
     def __init__(self, max_pages: int = 5):
         """
         Initialize collector.
@@ -193,50 +337,74 @@ class ArbeitnowCollector(BaseCollector):
     def collect(self) -> Generator[JobPosting, None, None]:
         """Fetch jobs from Arbeitnow API."""
         
-        for page in range(1, self.max_pages + 1):
-            print(f"  📥 Fetching page {page} from Arbeitnow...")
-            
-            try:
-                response = requests.get(
-                    self.BASE_URL,
-                    params={"page": page},
-                    timeout=30
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                jobs = data.get("data", [])
-                print(f"     Found {len(jobs)} jobs")
-                
-                if not jobs:
+        # Pages are requested in parallel and consumed in order; the first
+        # empty page still ends the listing
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            for jobs in executor.map(self._fetch_page, range(1, self.max_pages + 1)):
+                if jobs is not None and not jobs:
                     break
                 
-                for job_data in jobs:
+                for job_data in jobs or []:
                     # Filter for tech jobs only
                     if self._is_tech_job(job_data):
                         job = self._parse_job(job_data)
                         if job:
                             yield job
-                
-                time.sleep(1)
-                
-            except requests.RequestException as e:
-                print(f"     ❌ Error fetching page {page}: {e}")
-                continue
     
-    def _is_tech_job(self, data: dict) -> bool:
-        """Check if job is tech-related."""
-        tech_keywords = [
-            'developer', 'engineer', 'programmer', 'software', 'data',
-            'devops', 'cloud', 'python', 'java', 'javascript', 'backend',
-            'frontend', 'fullstack', 'machine learning', 'ai ', 'ml ',
-            'analyst', 'architect', 'security', 'database', 'api'
-        ]
+    def _fetch_page(self, page: int) -> Optional[list[dict]]:
+        """Raw job dicts for one page (None on error, so a failed page doesn't end the listing)."""
+        logger.info("  📥 Fetching page %d from Arbeitnow...", page)
         
-        title = data.get("title", "").lower()
-        tags = " ".join(data.get("tags", [])).lower()
+        try:
+            data = _get_json(self.BASE_URL, {"page": page}, self.RATE_LIMITER)
+        except (requests.RequestException, ValueError) as e:  # ValueError: body isn't JSON
+            logger.warning("     ❌ Error fetching page %d: %s", page, e)
+            return None
         
-        return any(kw in title or kw in tags for kw in tech_keywords)
+        jobs = data.get("data", [])
+        logger.info("     Found %d jobs", len(jobs))
+        return jobs
+    
+    async def collect_async(self) -> AsyncGenerator[JobPosting, None]:
+        """
+        Async version of collect(): all pages are requested on one event loop
+        and consumed in order, stopping at the first empty page.
+        """
+        async with httpx.AsyncClient(timeout=30) as client:
+            pages = await asyncio.gather(*(
+                self._fetch_page_async(client, page) for page in range(1, self.max_pages + 1)
+            ))
+        
+        for jobs in pages:
+            if jobs is not None and not jobs:
+                break
+            
+            for job_data in jobs or []:
+                if self._is_tech_job(job_data):
+                    job = self._parse_job(job_data)
+                    if job:
+                        yield job
+    
+    async def _fetch_page_async(self, client: httpx.AsyncClient, page: int) -> Optional[list[dict]]:
+        """Async version of _fetch_page."""
+        logger.info("  📥 Fetching page %d from Arbeitnow...", page)
+        
+        try:
+            data = await _aget_json(client, self.BASE_URL, {"page": page}, self.RATE_LIMITER)
+        except (httpx.HTTPError, ValueError) as e:  # ValueError: body isn't JSON
+            logger.warning("     ❌ Error fetching page %d: %s", page, e)
+            return None
+        
+        jobs = data.get("data", [])
+        logger.info("     Found %d jobs", len(jobs))
+        return jobs
+    
+    def _is_tech_job(self, data: dict) -> bool:
+        """Check if job is tech-related."""
+        # Title and tags in one scan; the newline keeps a keyword from
+        # matching across the two
+        text = data.get("title", "") + "\n" + " ".join(data.get("tags", []))
+        return self.TECH_RE.search(text.lower()) is not None
     
     def _parse_job(self, data: dict) -> JobPosting:
         """Convert API response to JobPosting."""
@@ -264,24 +432,13 @@ class ArbeitnowCollector(BaseCollector):
             
             return job
             
-        except Exception as e:
-            print(f"     ⚠️ Error parsing job: {e}")
+        except Exception:
+            logger.exception("     ⚠️ Error parsing job")
             return None
     
     def _guess_experience_level(self, title: str) -> str:
         """Guess experience level from job title."""
-        title_lower = title.lower()
-        
-        if any(x in title_lower for x in ['senior', 'sr.', 'lead', 'principal', 'staff']):
-            if 'principal' in title_lower or 'staff' in title_lower:
-                return 'Principal'
-            elif 'lead' in title_lower:
-                return 'Lead'
-            return 'Senior'
-        elif any(x in title_lower for x in ['junior', 'jr.', 'entry', 'intern']):
-            return 'Entry'
-        else:
-            return 'Mid'
+        return _guess_experience_level(title, self.SENIOR_RE, self.ENTRY_RE)
 
 
 def fetch_real_jobs(include_remotive: bool = True, include_arbeitnow: bool = True) -> list[JobPosting]:
@@ -308,7 +465,7 @@ def fetch_real_jobs(include_remotive: bool = True, include_arbeitnow: bool = Tru
     if include_arbeitnow:
         manager.add_collector(ArbeitnowCollector(max_pages=3))
     
-    return manager.collect_all()
+    return manager.collect_all_list()
 
 
 # Test the real collectors
@@ -316,6 +473,7 @@ if __name__ == "__main__":
     from src.etl.database import JobDatabase
     from src.rag.vector_store import JobVectorStore
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("🚀 Fetching REAL Job Data\n")
     print("="*60)
     
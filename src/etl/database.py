@@ -2,17 +2,142 @@
 Database layer for storing and retrieving job postings.
 Uses SQLite - a simple, file-based database (no server needed!).
 """
+import logging
+import os
+import re
 import sqlite3
 import json
-from datetime import datetime
+import threading
+import weakref
 from pathlib import Path
 from typing import Optional
 from contextlib import contextmanager
+from functools import lru_cache
+
+import pandas as pd
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.data_collection.models import JobPosting
 
+logger = logging.getLogger(__name__)
+
+
+# Title keywords -> base role; first match wins (LIKE is case-insensitive)
+ROLE_KEYWORDS = [
+    ('Data Engineer', ('data engineer',)),
+    ('ML Engineer', ('machine learning', 'ml engineer')),
+    ('AI Engineer', ('ai engineer',)),
+    ('Data Scientist', ('data scientist',)),
+    ('Backend Engineer', ('backend',)),
+    ('Full Stack Engineer', ('full stack', 'fullstack')),
+    ('DevOps Engineer', ('devops', 'sre')),
+    ('Analytics Engineer', ('analytics',)),
+]
+
+# Location keywords -> simplified location; anything else keeps its city name
+LOCATION_KEYWORDS = [
+    ('Remote', ('remote',)),
+    ('San Francisco', ('san francisco', 'sf')),
+    ('New York', ('new york', 'nyc')),
+    ('Seattle', ('seattle',)),
+    ('Austin', ('austin',)),
+    ('Los Angeles', ('los angeles', 'la')),
+]
+
+
+def _case_sql(column: str, keywords: list, default: str) -> tuple[str, list]:
+    """
+    Build a SQL CASE expression that labels `column` by the first matching keyword.
+    Returns (sql, params) - keywords and labels are bound, never pasted into the SQL.
+    """
+    sql = ["CASE"]
+    params = []
+    for label, needles in keywords:
+        sql.append("WHEN " + " OR ".join(f"{column} LIKE ?" for _ in needles) + " THEN ?")
+        params.extend(f"%{needle}%" for needle in needles)
+        params.append(label)
+    sql.append(f"ELSE {default} END")
+    return " ".join(sql), params
+
+
+# Built once at import - every query reuses the same SQL text and parameters
+_CITY_SQL = "CASE WHEN instr(location, ',') > 0 THEN substr(location, 1, instr(location, ',') - 1) ELSE location END"
+_ROLE_CASE_SQL, _ROLE_CASE_PARAMS = _case_sql("title", ROLE_KEYWORDS, "'Other'")
+_LOCATION_CASE_SQL, _LOCATION_CASE_PARAMS = _case_sql("location", LOCATION_KEYWORDS, _CITY_SQL)
+
+# Skills live only in job_skills; rows get them back as one unit-separator
+# joined string (served by idx_skills_job)
+_SKILL_SEP = "\x1f"
+_SKILLS_SQL = "(SELECT GROUP_CONCAT(skill, char(31)) FROM job_skills WHERE job_skills.job_id = jobs.id) AS skills"
+_JOB_SELECT_SQL = f"""
+    SELECT id, title, company, location, description, salary_min, salary_max,
+           salary_currency, job_type, experience_level, remote, source, url,
+           posted_date, scraped_at, {_SKILLS_SQL}
+    FROM jobs
+"""
+
+
+@lru_cache(maxsize=64)
+def _search_sql(
+    text_mode: Optional[str],
+    company: bool,
+    location: bool,
+    experience_level: bool,
+    remote_only: bool,
+    min_salary: bool,
+    n_skills: int
+) -> str:
+    """
+    SQL for one search_jobs filter shape (which filters are set, not their values).
+    Cached, so repeated shapes skip rebuilding the string - and every call with
+    the same shape hands sqlite3 identical text for its statement cache.
+    """
+    conditions = []
+    
+    if text_mode == 'fts':
+        conditions.append("rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+    elif text_mode == 'like':
+        conditions.append("(title LIKE ? OR description LIKE ? OR company LIKE ?)")
+    
+    if company:
+        conditions.append("company LIKE ?")
+    
+    if location:
+        conditions.append("location LIKE ?")
+    
+    if experience_level:
+        conditions.append("experience_level = ?")
+    
+    if remote_only:
+        conditions.append("remote = 1")
+    
+    if min_salary:
+        conditions.append("salary_min >= ?")
+    
+    if n_skills:
+        # Any of the skills - resolved through the job_skills index,
+        # before LIMIT, so the limit counts matching jobs
+        conditions.append(f"id IN (SELECT job_id FROM job_skills WHERE skill IN ({','.join('?' * n_skills)}))")
+    
+    sql = _JOB_SELECT_SQL
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    return sql + " ORDER BY scraped_at DESC LIMIT ?"
+
+
+class _ThreadConnection:
+    """
+    One thread's connection. It lives in that thread's threading.local, so when
+    the thread exits this holder is garbage collected and the finalizer closes
+    the connection (Streamlit runs sessions on short-lived threads).
+    """
+    __slots__ = ("conn", "close", "__weakref__")
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.close = weakref.finalize(self, conn.close)
+
 
 class JobDatabase:
     """
@@ -29,17 +154,58 @@ class JobDatabase:
         """
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        # One connection per thread (Streamlit serves sessions from several
+        # threads), closed when its thread exits. Tracked weakly so close()
+        # can reach the live ones without keeping dead threads' alive
+        self._local = threading.local()
+        self._connections: weakref.WeakSet[_ThreadConnection] = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+        
         self._init_db()
+        
+        # get_stats() result, reused until the data changes
+        self._writes = 0
+        self._stats_cache: Optional[tuple[tuple, dict]] = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open and tune a new connection."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Access columns by name
+        conn.execute("PRAGMA journal_mode=WAL")  # readers don't block the writer
+        conn.execute("PRAGMA synchronous=NORMAL")  # safe with WAL, far fewer fsyncs
+        conn.execute("PRAGMA cache_size=-64000")  # ~64MB page cache
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped reads
+        return conn
     
     @contextmanager
     def _get_connection(self):
-        """Create a database connection (safely closes when done)."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Access columns by name
+        """
+        Get this thread's database connection, opening it on first use.
+        The connection stays open (and its page cache warm) until the thread
+        exits; anything left uncommitted by a failed block is rolled back.
+        """
+        holder = getattr(self._local, 'connection', None)
+        if holder is None:
+            holder = _ThreadConnection(self._connect())
+            self._local.connection = holder
+            with self._connections_lock:
+                self._connections.add(holder)
+        conn = holder.conn
         try:
             yield conn
         finally:
-            conn.close()
+            if conn.in_transaction:
+                conn.rollback()
+    
+    def close(self):
+        """Close every connection this database still has open."""
+        with self._connections_lock:
+            holders, self._connections = list(self._connections), weakref.WeakSet()
+        for holder in holders:
+            holder.close()
+        self._local = threading.local()
     
     def _init_db(self):
         """Create tables if they don't exist."""
@@ -60,7 +226,6 @@ class JobDatabase:
                     job_type TEXT DEFAULT 'Full-time',
                     experience_level TEXT,
                     remote INTEGER DEFAULT 0,
-                    skills TEXT,
                     source TEXT,
                     url TEXT,
                     posted_date TEXT,
@@ -83,11 +248,125 @@ class JobDatabase:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs(location)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_experience ON jobs(experience_level)')
+            # "Latest jobs" (search_jobs' ORDER BY) reads the index instead of sorting the table
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs(scraped_at DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_remote_scraped ON jobs(remote, scraped_at DESC)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_skills_skill ON job_skills(skill)')
+            # Covering index for skill aggregations (GROUP BY skill + join on job_id)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_skills_skill_job ON job_skills(skill, job_id)')
+            # Rebuilding a job's skill list
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_skills_job ON job_skills(job_id)')
+            
+            self._drop_legacy_skills_column(cursor)
+            
+            self._fts = self._init_fts(cursor)
             
             conn.commit()
             print("✅ Database initialized")
     
+    # Jobs whose skills are only in the legacy JSON column, not in job_skills
+    _LEGACY_ONLY_SKILLS_SQL = '''
+        SELECT id, skills FROM jobs
+        WHERE skills IS NOT NULL AND skills NOT IN ('', '[]')
+          AND NOT EXISTS (SELECT 1 FROM job_skills WHERE job_skills.job_id = jobs.id)
+    '''
+    
+    def _drop_legacy_skills_column(self, cursor: sqlite3.Cursor):
+        """
+        Older databases also kept every job's skills as a JSON column, duplicating
+        job_skills. Jobs whose skills only live in that column are copied into
+        job_skills first; the column is dropped only once nothing would be lost,
+        and only where SQLite supports it (3.35+). Otherwise it stays, unused.
+        """
+        cursor.execute("PRAGMA table_info(jobs)")
+        if not any(column['name'] == 'skills' for column in cursor.fetchall()):
+            return
+        
+        cursor.execute(self._LEGACY_ONLY_SKILLS_SQL)
+        rows, unreadable = [], 0
+        for job_id, skills_json in cursor.fetchall():
+            try:
+                # Lowercased like _insert_job; "Python" and "python" become one row
+                skills = dict.fromkeys(skill.lower() for skill in json.loads(skills_json))
+                rows.extend((job_id, skill) for skill in skills)
+            except (ValueError, TypeError, AttributeError):  # AttributeError: a non-string skill
+                unreadable += 1
+        if rows:
+            cursor.executemany(self._INSERT_SKILL_SQL, rows)
+            logger.info("🔁 Copied %d legacy skill entries into job_skills", len(rows))
+        
+        if unreadable:
+            logger.warning(
+                "⚠️ %d jobs have skills only in the legacy jobs.skills column that couldn't be "
+                "parsed - keeping the column", unreadable
+            )
+            return
+        
+        if sqlite3.sqlite_version_info < (3, 35, 0):
+            logger.info("SQLite %s can't drop columns - keeping the unused jobs.skills column", sqlite3.sqlite_version)
+            return
+        
+        try:
+            cursor.execute("ALTER TABLE jobs DROP COLUMN skills")
+        except sqlite3.OperationalError:
+            logger.warning("⚠️ Could not drop the legacy jobs.skills column", exc_info=True)
+    
+    def _init_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        Full-text index over title/company/description, kept in sync by triggers.
+        Returns False if this SQLite build has no FTS5 (search falls back to LIKE).
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts'")
+        exists = cursor.fetchone() is not None
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                    title, company, description,
+                    content='jobs', content_rowid='rowid', tokenize='porter unicode61'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return False
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+                INSERT INTO jobs_fts(rowid, title, company, description)
+                VALUES (new.rowid, new.title, new.company, new.description);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description)
+                VALUES ('delete', old.rowid, old.title, old.company, old.description);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description)
+                VALUES ('delete', old.rowid, old.title, old.company, old.description);
+                INSERT INTO jobs_fts(rowid, title, company, description)
+                VALUES (new.rowid, new.title, new.company, new.description);
+            END
+        ''')
+        
+        # Index jobs that were stored before the FTS table existed
+        if not exists:
+            cursor.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+        return True
+    
+    @staticmethod
+    def _fts_query(text: str) -> Optional[str]:
+        """
+        Turn free text into a safe FTS5 query: every word must appear, as a
+        prefix ("engin" finds "engineer"). Quoting each word keeps FTS syntax
+        characters in user input from being interpreted.
+        """
+        words = re.findall(r"\w+", text)
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+    
     def insert_job(self, job: JobPosting) -> bool:
         """
         Insert a single job into the database.
@@ -97,50 +376,100 @@ class JobDatabase:
             cursor = conn.cursor()
             
             try:
-                # Insert job
-                cursor.execute('''
-                    INSERT OR IGNORE INTO jobs 
-                    (id, title, company, location, description, salary_min, salary_max,
-                     salary_currency, job_type, experience_level, remote, skills,
-                     source, url, posted_date, scraped_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    job.id, job.title, job.company, job.location, job.description,
-                    job.salary_min, job.salary_max, job.salary_currency, job.job_type,
-                    job.experience_level, int(job.remote), json.dumps(job.skills),
-                    job.source, job.url,
-                    job.posted_date.isoformat() if job.posted_date else None,
-                    job.scraped_at.isoformat()
-                ))
-                
-                # Insert skills (for easier querying)
-                if cursor.rowcount > 0:  # Only if job was actually inserted
-                    for skill in job.skills:
-                        cursor.execute('''
-                            INSERT INTO job_skills (job_id, skill)
-                            VALUES (?, ?)
-                        ''', (job.id, skill.lower()))
-                
+                inserted = self._insert_job(cursor, job)
                 conn.commit()
-                return cursor.rowcount > 0
+                self._writes += 1
+                return inserted
                 
             except sqlite3.Error as e:
                 print(f"❌ Error inserting job: {e}")
                 return False
     
-    def insert_many(self, jobs: list[JobPosting]) -> tuple[int, int]:
+    # Column order for the jobs INSERT; _job_row builds tuples in the same order
+    _INSERT_JOB_SQL = '''
+        INSERT OR IGNORE INTO jobs 
+        (id, title, company, location, description, salary_min, salary_max,
+         salary_currency, job_type, experience_level, remote,
+         source, url, posted_date, scraped_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    _INSERT_SKILL_SQL = 'INSERT INTO job_skills (job_id, skill) VALUES (?, ?)'
+    
+    # Stay under SQLite's default limit of 999 bound variables per statement
+    _MAX_SQL_VARS = 900
+    
+    @staticmethod
+    def _job_row(job: JobPosting) -> tuple:
+        """The parameter tuple for one job in _INSERT_JOB_SQL."""
+        return (
+            job.id, job.title, job.company, job.location, job.description,
+            job.salary_min, job.salary_max, job.salary_currency, job.job_type,
+            job.experience_level, int(job.remote), job.source, job.url,
+            job.posted_date.isoformat() if job.posted_date else None,
+            job.scraped_at.isoformat()
+        )
+    
+    def _insert_job(self, cursor: sqlite3.Cursor, job: JobPosting) -> bool:
+        """Insert a job (and its skills) using an existing cursor - no commit."""
+        cursor.execute(self._INSERT_JOB_SQL, self._job_row(job))
+        
+        # Insert skills (for easier querying)
+        if cursor.rowcount <= 0:  # Job already exists
+            return False
+        
+        cursor.executemany(self._INSERT_SKILL_SQL, [(job.id, skill.lower()) for skill in job.skills])
+        return True
+    
+    def _existing_ids(self, cursor: sqlite3.Cursor, ids: list[str]) -> set[str]:
+        """Which of `ids` are already in the jobs table."""
+        existing = set()
+        for i in range(0, len(ids), self._MAX_SQL_VARS):
+            chunk = ids[i:i + self._MAX_SQL_VARS]
+            cursor.execute(
+                f"SELECT id FROM jobs WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            existing.update(row[0] for row in cursor.fetchall())
+        return existing
+    
+    def insert_many(self, jobs: list[JobPosting], batch_size: int = 1000) -> tuple[int, int]:
         """
         Insert multiple jobs efficiently.
+        Each batch is one transaction with two executemany() calls (jobs, then
+        skills) instead of a statement per job and per skill.
         Returns (inserted_count, skipped_count).
         """
         inserted = 0
         skipped = 0
         
-        for job in jobs:
-            if self.insert_job(job):
-                inserted += 1
-            else:
-                skipped += 1
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            for i in range(0, len(jobs), batch_size):
+                batch = jobs[i:i + batch_size]
+                try:
+                    # Only new jobs get skill rows - look up existing ids first
+                    # (and drop repeats within the batch) so nothing is orphaned
+                    existing = self._existing_ids(cursor, [job.id for job in batch])
+                    new_jobs = {job.id: job for job in batch if job.id not in existing}.values()
+                    
+                    cursor.executemany(self._INSERT_JOB_SQL, [self._job_row(job) for job in new_jobs])
+                    cursor.executemany(self._INSERT_SKILL_SQL, [
+                        (job.id, skill.lower()) for job in new_jobs for skill in job.skills
+                    ])
+                    conn.commit()
+                    self._writes += 1
+                except sqlite3.Error as e:
+                    conn.rollback()
+                    print(f"❌ Error inserting batch: {e}")
+                    continue
+                
+                inserted += len(new_jobs)
+                skipped += len(batch) - len(new_jobs)
+            
+            # Refresh planner statistics so the indexes get picked for the new data
+            if inserted:
+                conn.execute("ANALYZE")
+                conn.commit()
         
         print(f"📊 Inserted: {inserted}, Skipped (duplicates): {skipped}")
         return inserted, skipped
@@ -149,7 +478,7 @@ class JobDatabase:
         """Get a single job by ID."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+            cursor.execute(_JOB_SELECT_SQL + ' WHERE id = ?', (job_id,))
             row = cursor.fetchone()
             
             if row:
@@ -171,145 +500,230 @@ class JobDatabase:
         Search jobs with various filters.
         This is how our AI agent will query the database!
         """
+        # Params are bound in the same order _search_sql lays out its conditions
+        fts_query = self._fts_query(query) if query and self._fts else None
+        text_mode = 'fts' if fts_query else ('like' if query else None)
+        sql = _search_sql(
+            text_mode, bool(company), bool(location), bool(experience_level),
+            remote_only, bool(min_salary), len(skills) if skills else 0
+        )
+        
+        params = []
+        if fts_query:
+            params.append(fts_query)
+        elif query:
+            params.extend([f"%{query}%"] * 3)
+        if company:
+            params.append(f"%{company}%")
+        if location:
+            params.append(f"%{location}%")
+        if experience_level:
+            params.append(experience_level)
+        if min_salary:
+            params.append(min_salary)
+        if skills:
+            params.extend(s.lower() for s in skills)
+        params.append(int(limit))
+        
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Build dynamic query
-            conditions = []
-            params = []
-            
-            if query:
-                conditions.append("(title LIKE ? OR description LIKE ? OR company LIKE ?)")
-                search = f"%{query}%"
-                params.extend([search, search, search])
-            
-            if company:
-                conditions.append("company LIKE ?")
-                params.append(f"%{company}%")
-            
-            if location:
-                conditions.append("location LIKE ?")
-                params.append(f"%{location}%")
-            
-            if experience_level:
-                conditions.append("experience_level = ?")
-                params.append(experience_level)
-            
-            if remote_only:
-                conditions.append("remote = 1")
-            
-            if min_salary:
-                conditions.append("salary_min >= ?")
-                params.append(min_salary)
-            
-            # Build final query
-            sql = "SELECT * FROM jobs"
-            if conditions:
-                sql += " WHERE " + " AND ".join(conditions)
-            sql += f" ORDER BY scraped_at DESC LIMIT {limit}"
-            
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-            
-            # Filter by skills if specified (need special handling)
-            jobs = [self._row_to_job(row) for row in rows]
-            
-            if skills:
-                skills_lower = [s.lower() for s in skills]
-                jobs = [
-                    job for job in jobs
-                    if any(s in [sk.lower() for sk in job.skills] for s in skills_lower)
-                ]
-            
-            return jobs
+            return [self._row_to_job(row) for row in conn.execute(sql, params).fetchall()]
     
     def get_all_jobs(self, limit: int = 1000) -> list[JobPosting]:
         """Get all jobs (up to limit)."""
         return self.search_jobs(limit=limit)
     
-    def get_stats(self) -> dict:
-        """Get database statistics - useful for analytics."""
+    def top_companies(self, n: int = 10) -> dict:
+        """Companies with the most openings."""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            stats = {}
-            
-            # Total jobs
-            cursor.execute("SELECT COUNT(*) FROM jobs")
-            stats['total_jobs'] = cursor.fetchone()[0]
-            
-            # Jobs by experience level
-            cursor.execute("""
-                SELECT experience_level, COUNT(*) as count 
-                FROM jobs 
-                GROUP BY experience_level
+            rows = conn.execute("""
+                SELECT company, COUNT(*) as count
+                FROM jobs
+                GROUP BY company
                 ORDER BY count DESC
-            """)
-            stats['by_experience'] = dict(cursor.fetchall())
-            
-            # Top companies
-            cursor.execute("""
-                SELECT company, COUNT(*) as count 
-                FROM jobs 
-                GROUP BY company 
-                ORDER BY count DESC 
-                LIMIT 10
-            """)
-            stats['top_companies'] = dict(cursor.fetchall())
-            
-            # Top skills
-            cursor.execute("""
-                SELECT skill, COUNT(*) as count 
-                FROM job_skills 
-                GROUP BY skill 
-                ORDER BY count DESC 
-                LIMIT 20
-            """)
-            stats['top_skills'] = dict(cursor.fetchall())
-            
-            # Remote vs On-site
-            cursor.execute("""
-                SELECT 
-                    SUM(CASE WHEN remote = 1 THEN 1 ELSE 0 END) as remote,
-                    SUM(CASE WHEN remote = 0 THEN 1 ELSE 0 END) as onsite
+                LIMIT ?
+            """, (n,)).fetchall()
+        return dict(rows)
+    
+    def location_counts(self, n: int = 10) -> dict:
+        """Job counts by simplified location (see LOCATION_KEYWORDS)."""
+        with self._get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT CASE WHEN location IS NULL OR location = '' THEN 'Unknown' ELSE {_LOCATION_CASE_SQL} END as place,
+                       COUNT(*) as count
                 FROM jobs
-            """)
-            row = cursor.fetchone()
-            stats['remote_distribution'] = {'remote': row[0], 'on_site': row[1]}
-            
-            # Average salary by experience
-            cursor.execute("""
-                SELECT experience_level, 
-                       AVG(salary_min) as avg_min, 
-                       AVG(salary_max) as avg_max
-                FROM jobs 
-                WHERE salary_min IS NOT NULL
-                GROUP BY experience_level
-            """)
-            stats['salary_by_experience'] = {
-                row[0]: {'min': round(row[1], 0), 'max': round(row[2], 0)}
-                for row in cursor.fetchall()
+                GROUP BY place
+                ORDER BY count DESC
+                LIMIT ?
+            """, (*_LOCATION_CASE_PARAMS, n)).fetchall()
+        return dict(rows)
+    
+    def salary_by_role(self) -> dict:
+        """Average salary range per base role (see ROLE_KEYWORDS)."""
+        with self._get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT {_ROLE_CASE_SQL} as role, AVG(salary_min), AVG(salary_max)
+                FROM jobs
+                GROUP BY role
+            """, _ROLE_CASE_PARAMS).fetchall()
+        
+        return {
+            role: {
+                'salary_min': round(avg_min, 0) if avg_min is not None else None,
+                'salary_max': round(avg_max, 0) if avg_max is not None else None
             }
-            
-            return stats
+            for role, avg_min, avg_max in rows
+        }
     
-    def _row_to_job(self, row: sqlite3.Row) -> JobPosting:
-        """Convert database row to JobPosting object."""
-        data = dict(row)
-        data['remote'] = bool(data['remote'])
-        data['skills'] = json.loads(data['skills']) if data['skills'] else []
+    def skill_salaries(self, min_count: int = 5, n: int = 15) -> dict:
+        """
+        Average salary (midpoint of the range) per skill, highest first.
+        Only skills seen in at least `min_count` salaried jobs are included.
+        """
+        with self._get_connection() as conn:
+            rows = conn.execute("""
+                SELECT s.skill, AVG((j.salary_min + j.salary_max) / 2.0) as avg_salary
+                FROM job_skills s
+                JOIN jobs j ON j.id = s.job_id
+                WHERE j.salary_max > 0
+                GROUP BY s.skill
+                HAVING COUNT(*) >= ?
+                ORDER BY avg_salary DESC
+                LIMIT ?
+            """, (min_count, n)).fetchall()
+        return {skill: round(avg_salary, 0) for skill, avg_salary in rows}
+    
+    def trending_skills(self, n: int = 10) -> dict:
+        """Most common skills among the most recently posted half of the jobs."""
+        with self._get_connection() as conn:
+            rows = conn.execute("""
+                SELECT skill, COUNT(*) as count
+                FROM job_skills
+                WHERE job_id IN (
+                    SELECT id FROM jobs
+                    ORDER BY posted_date DESC
+                    LIMIT (SELECT COUNT(*) FROM jobs) / 2
+                )
+                GROUP BY skill
+                ORDER BY count DESC
+                LIMIT ?
+            """, (n,)).fetchall()
+        return dict(rows)
+    
+    def jobs_dataframe(self, limit: Optional[int] = 10000, chunksize: int = 2000) -> pd.DataFrame:
+        """
+        Get jobs as a pandas DataFrame, straight from SQL.
+        Much faster than building JobPosting objects and converting them row by row.
+        Rows are read and converted `chunksize` at a time to keep peak memory down.
+        Pass limit=None for every job.
+        """
+        with self._get_connection() as conn:
+            chunks = [
+                self._prepare_jobs_chunk(chunk)
+                for chunk in pd.read_sql_query(
+                    f"""
+                    SELECT id, title, company, location, salary_min, salary_max,
+                           experience_level, remote, {_SKILLS_SQL}, posted_date, source
+                    FROM jobs
+                    ORDER BY scraped_at DESC
+                    LIMIT ?
+                    """,
+                    conn,
+                    params=(-1 if limit is None else limit,),  # LIMIT -1 = no limit
+                    parse_dates=['posted_date'],
+                    chunksize=chunksize
+                )
+            ]
         
-        # Handle dates
-        if data.get('posted_date'):
-            data['posted_date'] = datetime.fromisoformat(data['posted_date'])
-        if data.get('scraped_at'):
-            data['scraped_at'] = datetime.fromisoformat(data['scraped_at'])
+        return pd.concat(chunks, ignore_index=True)
+    
+    @staticmethod
+    def _prepare_jobs_chunk(df: pd.DataFrame) -> pd.DataFrame:
+        """Convert one chunk of raw rows to analysis-friendly columns."""
+        # Compact numeric dtypes: half the memory of float64 and fast vectorized math
+        df = df.astype({'salary_min': 'float32', 'salary_max': 'float32', 'remote': 'bool'})
+        df['skills'] = [skills.split(_SKILL_SEP) if skills else [] for skills in df['skills']]
+        return df
+    
+    def data_version(self) -> tuple:
+        """
+        Cheap fingerprint of the database contents.
+        Changes whenever jobs are written - by this process or by another
+        one (e.g. refresh_data.py running while the app is up).
+        """
+        version = [self._writes]
+        for path in (self.db_path, f"{self.db_path}-wal"):
+            try:
+                st = os.stat(path)
+                version.extend((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                version.extend((0, 0))
+        return tuple(version)
+    
+    def get_stats(self) -> dict:
+        """
+        Get database statistics - useful for analytics.
+        All aggregation happens in SQL; the result is cached until the data changes.
+        """
+        version = self.data_version()
+        if self._stats_cache and self._stats_cache[0] == version:
+            return self._stats_cache[1]
         
-        # Remove fields not in JobPosting
-        data.pop('created_at', None)
-        data.pop('id', None)  # Will be regenerated
+        stats = self._compute_stats()
+        self._stats_cache = (version, stats)
+        return stats
+    
+    # Every get_stats() section in one statement: each CTE folds its rows into a
+    # JSON array of [key, value] pairs (in the CTE's ORDER BY order)
+    _STATS_SQL = """
+        WITH
+            experience AS (
+                SELECT experience_level AS k, COUNT(*) AS v
+                FROM jobs GROUP BY experience_level ORDER BY v DESC
+            ),
+            companies AS (
+                SELECT company AS k, COUNT(*) AS v
+                FROM jobs GROUP BY company ORDER BY v DESC LIMIT 10
+            ),
+            skills AS (
+                SELECT skill AS k, COUNT(*) AS v
+                FROM job_skills GROUP BY skill ORDER BY v DESC LIMIT 20
+            ),
+            salaries AS (
+                SELECT experience_level AS k, json_array(AVG(salary_min), AVG(salary_max)) AS v
+                FROM jobs WHERE salary_min IS NOT NULL GROUP BY experience_level
+            )
+        SELECT
+            (SELECT COUNT(*) FROM jobs),
+            (SELECT json_group_array(json_array(k, v)) FROM experience),
+            (SELECT json_group_array(json_array(k, v)) FROM companies),
+            (SELECT json_group_array(json_array(k, v)) FROM skills),
+            (SELECT SUM(CASE WHEN remote = 1 THEN 1 ELSE 0 END) FROM jobs),
+            (SELECT SUM(CASE WHEN remote = 0 THEN 1 ELSE 0 END) FROM jobs),
+            (SELECT json_group_array(json_array(k, json(v))) FROM salaries)
+    """
+    
+    def _compute_stats(self) -> dict:
+        """Run the aggregation query behind get_stats() - one round trip."""
+        with self._get_connection() as conn:
+            total, experience, companies, skills, remote, onsite, salaries = (
+                conn.execute(self._STATS_SQL).fetchone()
+            )
         
-        return JobPosting(**data)
+        return {
+            'total_jobs': total,
+            'by_experience': dict(json.loads(experience)),
+            'top_companies': dict(json.loads(companies)),
+            'top_skills': dict(json.loads(skills)),
+            'remote_distribution': {'remote': remote, 'on_site': onsite},
+            'salary_by_experience': {
+                level: {'min': round(avg_min, 0), 'max': round(avg_max, 0)}
+                for level, (avg_min, avg_max) in json.loads(salaries)
+            },
+        }
+    
+    def _row_to_job(self, row: sqlite3.Row) -> JobPosting:
+        """Convert database row to JobPosting object (keeps the stored id)."""
+        return JobPosting.from_row(row, row['skills'].split(_SKILL_SEP) if row['skills'] else [])
     
     def clear_all(self):
         """Delete all data (use carefully!)."""
@@ -318,6 +732,7 @@ class JobDatabase:
             cursor.execute("DELETE FROM job_skills")
             cursor.execute("DELETE FROM jobs")
             conn.commit()
+            self._writes += 1
             print("🗑️ All data cleared")
 
 
@@ -0,0 +1,94 @@
+"""
+Disk cache for document embeddings.
+
+Embedding is the slow part of loading jobs into the vector store, and a
+refresh mostly sees jobs (and so document texts) we've embedded before.
+Vectors are stored in a small SQLite file keyed by a hash of the text, so
+they survive restarts and clearing the vector store.
+"""
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+# SQLite's default limit on ? placeholders per statement (kept well under)
+_MAX_SQL_VARS = 900
+
+
+class EmbeddingCache:
+    """
+    Maps sha256(model + text) -> float32 embedding, stored as a BLOB.
+    Safe to share between threads (add_jobs embeds on a worker thread).
+    """
+    
+    def __init__(self, db_path: str = "data/emb_cache.sqlite", model: str = "all-MiniLM-L6-v2"):
+        """
+        Open (or create) the cache.
+        
+        Args:
+            db_path: SQLite file to keep the vectors in
+            model: Embedding model name - part of the key, so switching models
+                never returns stale vectors
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._prefix = model.encode() + b"\0"
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, emb BLOB NOT NULL)")
+        self._conn.commit()
+    
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(self._prefix + text.encode()).digest()
+    
+    def embed(self, texts: list[str], embed_fn: Callable[[list[str]], list]) -> list[list[float]]:
+        """
+        Embeddings for `texts`, in order. Only texts not seen before are passed
+        to `embed_fn` (in one call), and their vectors are saved for next time.
+        """
+        keys = [self._key(text) for text in texts]
+        vectors = self._lookup(set(keys))
+        
+        # Each new text once, even if it shows up several times in `texts`
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        
+        if missing:
+            computed = np.asarray(embed_fn(list(missing.values())), dtype=np.float32)
+            rows = [(key, vector.tobytes()) for key, vector in zip(missing, computed)]
+            with self._lock:
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings (hash, emb) VALUES (?, ?)", rows)
+                self._conn.commit()
+            vectors.update(zip(missing, computed))
+        
+        return [vectors[key].tolist() for key in keys]
+    
+    def _lookup(self, keys: set[bytes]) -> dict[bytes, np.ndarray]:
+        """Cached vectors for whichever of `keys` we have."""
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), _MAX_SQL_VARS):
+                chunk = keys[i:i + _MAX_SQL_VARS]
+                placeholders = ",".join("?" * len(chunk))
+                for key, blob in self._conn.execute(
+                    f"SELECT hash, emb FROM embeddings WHERE hash IN ({placeholders})", chunk
+                ):
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -8,13 +8,74 @@ What is a Vector Store?
 """
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
 from typing import Optional
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import asyncio
 import json
+import os
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.data_collection.models import JobPosting
+from src.rag.embedding_cache import EmbeddingCache
+
+# The text that gets embedded for each job; the salary line is only filled in when known
+_DOCUMENT_TEMPLATE = (
+    "Job Title: {title}\n"
+    "Company: {company}\n"
+    "Location: {location}\n"
+    "Experience Level: {experience_level}\n"
+    "{salary}"
+    "Remote: {remote}\n"
+    "Skills: {skills}\n"
+    "Description: {description}"
+)
+
+
+def _make_embedding_function():
+    """
+    all-MiniLM-L6-v2 through ONNX Runtime - the same model and vectors as
+    Chroma's default, but run on the GPU when onnxruntime can see one.
+    """
+    try:
+        import onnxruntime
+        available = onnxruntime.get_available_providers()
+        providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in available]
+    except ImportError:
+        providers = None
+    return embedding_functions.ONNXMiniLM_L6_V2(preferred_providers=providers or None)
+
+
+@lru_cache(maxsize=64)
+def _build_where(experience_level: Optional[str], remote_only: bool, min_salary: Optional[float]) -> Optional[dict]:
+    """
+    ChromaDB `where` filter for a search's filters (None for no filters).
+    Cached per combination - treat the result as read-only.
+    """
+    filters = []
+    
+    if experience_level:
+        filters.append({"experience_level": {"$eq": experience_level}})
+    
+    if remote_only:
+        filters.append({"remote": {"$eq": "True"}})
+    
+    if min_salary:
+        filters.append({"salary_min": {"$gte": min_salary}})
+    
+    # ChromaDB requires $and wrapper for multiple conditions
+    if not filters:
+        return None
+    return filters[0] if len(filters) == 1 else {"$and": filters}
 
 
 class JobVectorStore:
@@ -23,107 +84,315 @@ class JobVectorStore:
     This enables AI-powered "smart" search that understands meaning!
     """
     
-    def __init__(self, persist_dir: str = "data/chroma_db"):
+    # SQLite settings for one-off bulk loads: no rollback journal, no fsync,
+    # temp tables in RAM and a single writer. A crash mid-load can corrupt the
+    # store, so only use this for rebuildable data and call finalize_bulk()
+    BULK_PRAGMAS = ("journal_mode=OFF", "synchronous=OFF", "temp_store=MEMORY", "locking_mode=EXCLUSIVE")
+    SAFE_PRAGMAS = ("locking_mode=NORMAL", "journal_mode=WAL", "synchronous=NORMAL")
+    
+    COLLECTION_NAME = "job_postings"
+    
+    # Metadata rows fetched per call when computing stats
+    STATS_PAGE_SIZE = 10_000
+    
+    # Index settings for new collections: cosine distance (so 1 - distance is
+    # the cosine similarity we show), a denser graph than the default M=16, and
+    # a wider search beam so filtered queries still find enough matches
+    HNSW_SETTINGS = {"hnsw:space": "cosine", "hnsw:M": 32, "hnsw:construction_ef": 200, "hnsw:search_ef": 100}
+    
+    # How many distinct query embeddings to keep around
+    QUERY_CACHE_SIZE = 2048
+    
+    # Search results cache: a query within this cosine of a cached one (with the
+    # same filters) gets the cached results without touching the index
+    SEARCH_CACHE_SIZE = 256
+    SIMILAR_QUERY_THRESHOLD = 0.95
+    
+    def __init__(
+        self,
+        persist_dir: str = "data/chroma_db",
+        bulk_ingest: bool = False,
+        host: Optional[str] = None,
+        port: Optional[int] = None
+    ):
         """
         Initialize the vector store.
         
         Args:
             persist_dir: Where to save the vector database
+            bulk_ingest: Open ChromaDB's SQLite with BULK_PRAGMAS for a big load.
+                Call `finalize_bulk()` (in a finally block) when the load is done.
+                Only applies to the local (non-server) mode.
+            host: ChromaDB server to use instead of local files
+                (defaults to $CHROMA_HOST; unset means local)
+            port: ChromaDB server port (defaults to $CHROMA_PORT or 8000)
         """
         self.persist_dir = persist_dir
         Path(persist_dir).mkdir(parents=True, exist_ok=True)
         
-        # Initialize ChromaDB with persistence
-        self.client = chromadb.PersistentClient(path=persist_dir)
+        self.host = host or os.getenv("CHROMA_HOST")
+        self.port = port or int(os.getenv("CHROMA_PORT", "8000"))
+        
+        # Initialize ChromaDB - a server if one is configured, else local files
+        if self.host:
+            self.client = chromadb.HttpClient(host=self.host, port=self.port)
+            self.bulk_ingest = False
+        else:
+            self.client = chromadb.PersistentClient(path=persist_dir)
+            self.bulk_ingest = bulk_ingest and self._set_sqlite_pragmas(self.BULK_PRAGMAS)
+        
+        # Same model Chroma uses by default (all-MiniLM-L6-v2), kept here so
+        # embeddings can be computed in bulk outside the collection
+        self.embedding_function = _make_embedding_function()
+        
+        # Document embeddings persisted next to the store, so re-ingesting jobs
+        # we've seen before (even after a clear) skips the model
+        self.embedding_cache = EmbeddingCache(str(Path(persist_dir).parent / "emb_cache.sqlite"))
+        
+        # Per-store LRU of query embeddings - people repeat the same searches a lot
+        self._cached_query_embedding = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._embed_query)
         
         # Create or get our jobs collection
-        self.collection = self.client.get_or_create_collection(
-            name="job_postings",
-            metadata={"description": "Job postings for semantic search"}
-        )
+        self.collection = self._open_collection()
+        
+        # Bumped on every write from this process (see data_version())
+        self.version = 0
+        
+        # (normalized query, filters) -> (unit query embedding, results), LRU order
+        self._search_cache: OrderedDict[tuple, tuple[np.ndarray, list[dict]]] = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        self._search_cache_version = self.data_version()
         
         print(f"✅ Vector store initialized with {self.collection.count()} documents")
     
+    def data_version(self) -> tuple:
+        """
+        Cheap fingerprint of the stored jobs, for invalidating caches.
+        Changes whenever jobs are written - by this process or by another one
+        (e.g. refresh_data.py running while the app is up).
+        """
+        if self.host:
+            # No files to look at - ask the server (upserts of existing jobs
+            # don't change the count, but refreshes that add jobs do)
+            return (self.version, self.collection.count())
+        
+        version = [self.version]
+        sqlite_path = Path(self.persist_dir) / "chroma.sqlite3"
+        for path in (sqlite_path, Path(f"{sqlite_path}-wal")):
+            try:
+                st = os.stat(path)
+                version.extend((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                version.extend((0, 0))
+        return tuple(version)
+    
+    def _open_collection(self):
+        """
+        Get the jobs collection, creating it with HNSW_SETTINGS if it's missing.
+        HNSW settings are fixed when a collection is built, so an existing
+        collection is opened as-is (clear() rebuilds it with the new settings).
+        """
+        existing = [getattr(c, "name", c) for c in self.client.list_collections()]
+        if self.COLLECTION_NAME in existing:
+            return self.client.get_collection(
+                name=self.COLLECTION_NAME,
+                embedding_function=self.embedding_function
+            )
+        return self.client.create_collection(
+            name=self.COLLECTION_NAME,
+            metadata={"description": "Job postings for semantic search", **self.HNSW_SETTINGS},
+            embedding_function=self.embedding_function
+        )
+    
+    def _set_sqlite_pragmas(self, pragmas) -> bool:
+        """
+        Run PRAGMAs on the SQLite connection ChromaDB uses for this thread.
+        This reaches into Chroma internals, so if they change we just warn.
+        """
+        try:
+            from chromadb.db.impl.sqlite import SqliteDB
+            conn = self.client._system.instance(SqliteDB)._conn_pool.connect()
+            for pragma in pragmas:
+                conn.execute(f"PRAGMA {pragma}")
+        except (ImportError, AttributeError, sqlite3.Error) as e:
+            print(f"⚠️ Could not set SQLite PRAGMAs on ChromaDB: {e}")
+            return False
+        return True
+    
+    def finalize_bulk(self):
+        """Put ChromaDB's SQLite back on safe settings after a bulk_ingest load."""
+        if self.bulk_ingest:
+            self._set_sqlite_pragmas(self.SAFE_PRAGMAS)
+            self.bulk_ingest = False
+    
     def add_job(self, job: JobPosting):
         """Add a single job to the vector store."""
         # Create a rich text document for embedding
         document = self._job_to_document(job)
         
-        # Create metadata for filtering
-        metadata = {
-            "company": job.company,
-            "location": job.location,
-            "experience_level": job.experience_level,
-            "remote": str(job.remote),
-            "salary_min": job.salary_min or 0,
-            "salary_max": job.salary_max or 0,
-            "skills": ", ".join(job.skills[:10]),  # Top 10 skills
-            "source": job.source
-        }
-        
-        # Add to collection (ChromaDB handles embedding automatically!)
-        self.collection.add(
+        # Add to collection, or update it if it's already there
+        # (ChromaDB handles embedding automatically!)
+        self.collection.upsert(
             documents=[document],
-            metadatas=[metadata],
+            metadatas=[self._job_to_metadata(job)],
             ids=[job.id]
         )
+        self.version += 1
     
-    def add_jobs(self, jobs: list[JobPosting], batch_size: int = 100):
+    def embed(self, texts: list[str]) -> list:
+        """Turn texts into embedding vectors (one per text)."""
+        return self.embedding_function(texts)
+    
+    def embed_documents(self, documents: list[str]) -> list:
+        """Like `embed`, but reuses cached vectors for documents embedded before."""
+        return self.embedding_cache.embed(documents, self.embed)
+    
+    def embed_query(self, query: str) -> list:
         """
-        Add multiple jobs efficiently in batches.
-        
-        Args:
-            jobs: List of job postings to add
-            batch_size: How many to process at once
+        Embedding for one search query, cached by its normalized text.
+        (The model lowercases anyway, so case and outer spaces don't matter.)
         """
+        return list(self._cached_query_embedding(query.strip().lower()))
+    
+    def _embed_query(self, normalized_query: str) -> tuple:
+        # Tuples so cached values can't be changed by callers
+        return tuple(np.asarray(self.embed([normalized_query])[0], dtype=float).tolist())
+    
+    def warmup(self):
+        """Load the embedding model now (it loads lazily on the first embed)."""
+        self.embed(["warmup"])
+    
+    def _prepare_batches(self, jobs: list[JobPosting], batch_size: Optional[int], embeddings: Optional[list]):
+        """
+        Split jobs into batches ready for `collection.upsert`, dropping repeats
+        of the same id within `jobs` (ChromaDB rejects duplicate ids in a call).
+        Returns ([(documents, metadatas, ids, vectors or None, jobs processed so far)], skipped).
+        """
+        batch_size = batch_size or int(os.getenv("CHROMA_BATCH", "200"))
         total = len(jobs)
-        added = 0
         skipped = 0
         
-        # Get existing IDs to avoid duplicates
-        existing_ids = set(self.collection.get()['ids'])
-        
-        # Also track IDs we're adding in this run to avoid duplicates within batch
+        # IDs we're storing in this run, to skip duplicates
         seen_ids = set()
         
+        batches = []
+        seen_add = seen_ids.add
+        to_document, to_metadata = self._job_to_document, self._job_to_metadata
         for i in range(0, total, batch_size):
             batch = jobs[i:i + batch_size]
             
-            # Prepare batch data
-            documents, metadatas, ids = [], [], []
+            # (position, job) for jobs not seen earlier in this run;
+            # seen_add() returns None, so it just records the id as it goes
+            new = [
+                (j, job) for j, job in enumerate(batch, start=i)
+                if job.id not in seen_ids and not seen_add(job.id)
+            ]
+            skipped += len(batch) - len(new)
             
-            for job in batch:
-                # Skip if already in DB or already seen in this run
-                if job.id in existing_ids or job.id in seen_ids:
-                    skipped += 1
-                    continue
-                
-                seen_ids.add(job.id)
-                documents.append(self._job_to_document(job))
-                metadatas.append({
-                    "company": job.company,
-                    "location": job.location,
-                    "experience_level": job.experience_level,
-                    "remote": str(job.remote),
-                    "salary_min": job.salary_min or 0,
-                    "salary_max": job.salary_max or 0,
-                    "skills": ", ".join(job.skills[:10]),
-                    "source": job.source
-                })
-                ids.append(job.id)
+            # Prepare batch data
+            documents = [to_document(job) for _, job in new]
+            metadatas = [to_metadata(job) for _, job in new]
+            ids = [job.id for _, job in new]
+            vectors = [embeddings[j] for j, _ in new] if embeddings is not None else None
             
-            # Add batch to collection
-            if documents:
-                self.collection.add(
-                    documents=documents,
-                    metadatas=metadatas,
-                    ids=ids
-                )
-                added += len(documents)
+            batches.append((documents, metadatas, ids, vectors, min(i + batch_size, total)))
+        
+        return batches, skipped
+    
+    def add_jobs(self, jobs: list[JobPosting], batch_size: Optional[int] = None, embeddings: Optional[list] = None):
+        """
+        Add (or update) multiple jobs efficiently in batches.
+        
+        Jobs are upserted: ones already in the store are overwritten with the
+        new data instead of being looked up first. Re-embedding them is cheap
+        since their documents hit the embedding cache.
+        
+        Args:
+            jobs: List of job postings to add
+            batch_size: How many to send per `collection.upsert` call. Each call is
+                one SQLite transaction inside ChromaDB; 50-250 amortizes that
+                cost without huge requests. Defaults to $CHROMA_BATCH or 200.
+            embeddings: Optional pre-computed embeddings, one per job. If
+                omitted, each batch is embedded here,
+                overlapped with writing the previous one.
+        
+        Returns:
+            (jobs stored, duplicate ids skipped within `jobs`)
+        """
+        total = len(jobs)
+        added = 0
+        
+        # Prepare every batch first (cheap), so embedding can run ahead of writing
+        batches, skipped = self._prepare_batches(jobs, batch_size, embeddings)
+        
+        # Pipeline: a worker thread embeds batch N+1 while this thread writes
+        # batch N (the ONNX model and SQLite both release the GIL). Writes stay
+        # on this thread because bulk_ingest PRAGMAs are per connection.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            def embed_batch(n: int):
+                if embeddings is None and n < len(batches) and batches[n][0]:
+                    return pool.submit(self.embed_documents, batches[n][0])
+                return None
             
-            print(f"  Progress: {min(i + batch_size, total)}/{total} jobs processed")
+            upcoming = embed_batch(0)
+            for n, (documents, metadatas, ids, vectors, progress) in enumerate(batches):
+                pending, upcoming = upcoming, embed_batch(n + 1)
+                
+                # Add batch to collection
+                if documents:
+                    if pending is not None:
+                        vectors = pending.result()
+                    self.collection.upsert(
+                        documents=documents,
+                        metadatas=metadatas,
+                        ids=ids,
+                        embeddings=vectors
+                    )
+                    added += len(documents)
+                
+                print(f"  Progress: {progress}/{total} jobs processed")
+        
+        self.version += 1
+        print(f"✅ Stored {added} jobs, skipped {skipped} duplicates")
+        return added, skipped
+    
+    async def add_jobs_async(
+        self,
+        jobs: list[JobPosting],
+        batch_size: Optional[int] = None,
+        embeddings: Optional[list] = None,
+        max_in_flight: int = 4
+    ):
+        """
+        Like `add_jobs`, for a ChromaDB server (CHROMA_HOST): up to
+        `max_in_flight` batches are embedded and sent at once, so network and
+        server time overlap instead of adding up. Needs a chromadb version
+        with AsyncHttpClient.
+        """
+        if not self.host:
+            raise RuntimeError("add_jobs_async needs a ChromaDB server - set CHROMA_HOST")
+        
+        client = await chromadb.AsyncHttpClient(host=self.host, port=self.port)
+        collection = await client.get_collection(name=self.COLLECTION_NAME)
+        
+        batches, skipped = self._prepare_batches(jobs, batch_size, embeddings)
+        semaphore = asyncio.Semaphore(max_in_flight)
+        
+        async def send(documents, metadatas, ids, vectors) -> int:
+            async with semaphore:
+                if vectors is None:
+                    vectors = await asyncio.to_thread(self.embed_documents, documents)
+                await collection.upsert(documents=documents, metadatas=metadatas, ids=ids, embeddings=vectors)
+            return len(ids)
         
-        print(f"✅ Added {added} jobs, skipped {skipped} duplicates")
+        counts = await asyncio.gather(*(
+            send(documents, metadatas, ids, vectors)
+            for documents, metadatas, ids, vectors, _ in batches if documents
+        ))
+        added = sum(counts)
+        
+        self.version += 1
+        print(f"✅ Stored {added} jobs, skipped {skipped} duplicates")
         return added, skipped
     
     def search(
@@ -152,52 +421,116 @@ class JobVectorStore:
         Returns:
             List of relevant jobs with similarity scores
         """
-        # Build filter conditions using ChromaDB's $and operator for multiple filters
-        where_conditions = None
-        filters = []
+        filters = (n_results, experience_level, remote_only, min_salary)
+        key = (query.strip().lower(), filters)
+        embedding = np.asarray(self.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        if norm:
+            embedding /= norm
         
-        if experience_level:
-            filters.append({"experience_level": {"$eq": experience_level}})
+        version = self.data_version()
+        cached = self._cached_search(key, embedding, version)
+        if cached is not None:
+            return cached
         
-        if remote_only:
-            filters.append({"remote": {"$eq": "True"}})
+        jobs = self.search_by_embedding(
+            embedding.tolist(),
+            n_results=n_results,
+            experience_level=experience_level,
+            remote_only=remote_only,
+            min_salary=min_salary
+        )
         
-        # ChromaDB requires $and wrapper for multiple conditions
-        if len(filters) == 1:
-            where_conditions = filters[0]
-        elif len(filters) > 1:
-            where_conditions = {"$and": filters}
+        with self._search_cache_lock:
+            if self._search_cache_version == version:
+                self._search_cache[key] = (embedding, jobs)
+                if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+        return jobs
+    
+    def _cached_search(self, key: tuple, embedding: np.ndarray, version: tuple) -> Optional[list[dict]]:
+        """Results for an exact or near-duplicate earlier search, if we have them."""
+        with self._search_cache_lock:
+            # Any write (from any process) makes every cached result stale
+            if self._search_cache_version != version:
+                self._search_cache.clear()
+                self._search_cache_version = version
+                return None
+            
+            hit = self._search_cache.get(key)
+            if hit is None:
+                candidates = [k for k in self._search_cache if k[1] == key[1]]
+                if not candidates:
+                    return None
+                similarities = np.stack([self._search_cache[k][0] for k in candidates]) @ embedding
+                best = int(similarities.argmax())
+                if similarities[best] < self.SIMILAR_QUERY_THRESHOLD:
+                    return None
+                key = candidates[best]
+                hit = self._search_cache[key]
+            
+            self._search_cache.move_to_end(key)
+            return hit[1]
+    
+    def search_by_embedding(
+        self,
+        embedding,
+        n_results: int = 10,
+        experience_level: Optional[str] = None,
+        remote_only: bool = False,
+        min_salary: Optional[float] = None
+    ) -> list[dict]:
+        """Same as `search`, for a query that is already embedded."""
+        return self.search_batch_by_embedding(
+            [embedding],
+            n_results=n_results,
+            experience_level=experience_level,
+            remote_only=remote_only,
+            min_salary=min_salary
+        )[0]
+    
+    def search_batch(self, queries: list[str], n_results: int = 10, **filters) -> list[list[dict]]:
+        """
+        Search for several queries at once - one embedding call and one index query.
+        Returns one result list per query (same format as `search`).
+        """
+        return self.search_batch_by_embedding(self.embed(queries), n_results=n_results, **filters)
+    
+    def search_batch_by_embedding(
+        self,
+        embeddings: list,
+        n_results: int = 10,
+        experience_level: Optional[str] = None,
+        remote_only: bool = False,
+        min_salary: Optional[float] = None
+    ) -> list[list[dict]]:
+        """Same as `search_batch`, for queries that are already embedded."""
+        where_conditions = _build_where(experience_level, remote_only, min_salary)
         
         # Perform semantic search
         results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results * 2,  # Get extra to filter
+            query_embeddings=list(embeddings),
+            n_results=n_results,
             where=where_conditions,
             include=["documents", "metadatas", "distances"]
         )
         
-        # Process results
-        jobs = []
-        for i, doc in enumerate(results['documents'][0]):
-            metadata = results['metadatas'][0][i]
-            distance = results['distances'][0][i]
-            
-            # Apply salary filter (can't do in ChromaDB query easily)
-            if min_salary and metadata.get('salary_min', 0) < min_salary:
-                continue
-            
-            # Convert distance to similarity score (0-1, higher is better)
-            similarity = max(0, 1 - distance)
-            
-            jobs.append({
-                "document": doc,
-                "metadata": metadata,
-                "similarity_score": round(similarity, 3),
-                "id": results['ids'][0][i]
-            })
-        
-        # Return top n results
-        return jobs[:n_results]
+        # Process results - one list per query. Distance is converted to a
+        # similarity score (0-1, higher is better)
+        return [
+            [
+                {
+                    "document": doc,
+                    "metadata": metadata,
+                    "similarity_score": round(max(0, 1 - distance), 3),
+                    "id": job_id
+                }
+                for doc, metadata, distance, job_id in zip(documents, metadatas, distances, ids)
+            ]
+            for documents, metadatas, distances, ids in zip(
+                results['documents'], results['metadatas'], results['distances'], results['ids']
+            )
+        ]
     
     def search_by_skills(self, skills: list[str], n_results: int = 10) -> list[dict]:
         """Search for jobs that require specific skills."""
@@ -206,77 +539,392 @@ class JobVectorStore:
     
     def find_similar_jobs(self, job_id: str, n_results: int = 5) -> list[dict]:
         """Find jobs similar to a specific job."""
-        # Get the original job's document
-        result = self.collection.get(ids=[job_id], include=["documents"])
+        # Use the job's stored embedding - no need to embed its text again
+        result = self.collection.get(ids=[job_id], include=["embeddings"])
         
-        if not result['documents']:
+        if result['embeddings'] is None or len(result['embeddings']) == 0:
             return []
         
         # Search for similar
-        return self.search(result['documents'][0], n_results + 1)[1:]  # Exclude itself
+        embedding = np.asarray(result['embeddings'][0], dtype=float).tolist()
+        similar = self.search_by_embedding(embedding, n_results + 1)
+        return [job for job in similar if job['id'] != job_id][:n_results]  # Exclude itself
     
     def get_collection_stats(self) -> dict:
-        """Get statistics about the vector store."""
-        all_data = self.collection.get(include=["metadatas"])
-        
-        stats = {
-            "total_documents": self.collection.count(),
-            "companies": {},
-            "experience_levels": {},
-            "remote_count": 0
-        }
-        
-        for metadata in all_data['metadatas']:
-            # Count companies
-            company = metadata.get('company', 'Unknown')
-            stats['companies'][company] = stats['companies'].get(company, 0) + 1
-            
-            # Count experience levels
-            level = metadata.get('experience_level', 'Unknown')
-            stats['experience_levels'][level] = stats['experience_levels'].get(level, 0) + 1
-            
-            # Count remote
-            if metadata.get('remote') == 'True':
-                stats['remote_count'] += 1
+        """
+        Get statistics about the vector store.
+        Metadata is read a page at a time, so memory stays flat however big
+        the collection gets.
+        """
+        companies, levels = Counter(), Counter()
+        total = remote_count = 0
         
-        # Get top 10 companies
-        stats['top_companies'] = dict(
-            sorted(stats['companies'].items(), key=lambda x: x[1], reverse=True)[:10]
-        )
-        del stats['companies']
+        offset = 0
+        while True:
+            metadatas = self.collection.get(include=["metadatas"], limit=self.STATS_PAGE_SIZE, offset=offset)['metadatas']
+            if not metadatas:
+                break
+            companies.update(m.get('company', 'Unknown') for m in metadatas)
+            levels.update(m.get('experience_level', 'Unknown') for m in metadatas)
+            remote_count += sum(1 for m in metadatas if m.get('remote') == 'True')
+            total += len(metadatas)
+            offset += len(metadatas)
         
-        return stats
+        return {
+            "total_documents": total,
+            "experience_levels": dict(levels),
+            "remote_count": remote_count,
+            "top_companies": dict(companies.most_common(10))
+        }
+    
+    def _job_to_metadata(self, job: JobPosting) -> dict:
+        """Metadata stored next to each job's vector (used for filtering and display)."""
+        return {
+            "company": job.company,
+            "location": job.location,
+            "experience_level": job.experience_level,
+            "remote": str(job.remote),
+            "salary_min": job.salary_min or 0,
+            "salary_max": job.salary_max or 0,
+            "skills": ", ".join(job.skills[:10]),  # Top 10 skills
+            "source": job.source
+        }
     
     def _job_to_document(self, job: JobPosting) -> str:
         """
         Convert job posting to a searchable document.
         We combine all important info into one text.
         """
-        parts = [
-            f"Job Title: {job.title}",
-            f"Company: {job.company}",
-            f"Location: {job.location}",
-            f"Experience Level: {job.experience_level}",
-            f"Remote: {'Yes' if job.remote else 'No'}",
-            f"Skills: {', '.join(job.skills)}",
-            f"Description: {job.description}"
-        ]
-        
         if job.salary_min and job.salary_max:
-            parts.insert(4, f"Salary: ${job.salary_min:,.0f} - ${job.salary_max:,.0f}")
+            salary = f"Salary: ${job.salary_min:,.0f} - ${job.salary_max:,.0f}\n"
+        else:
+            salary = ""
         
-        return "\n".join(parts)
+        return _DOCUMENT_TEMPLATE.format(
+            title=job.title,
+            company=job.company,
+            location=job.location,
+            experience_level=job.experience_level,
+            salary=salary,
+            remote='Yes' if job.remote else 'No',
+            skills=', '.join(job.skills),
+            description=job.description
+        )
     
     def clear(self):
         """Clear all data from the vector store."""
-        self.client.delete_collection("job_postings")
-        self.collection = self.client.create_collection(
-            name="job_postings",
-            metadata={"description": "Job postings for semantic search"}
-        )
+        self.client.delete_collection(self.COLLECTION_NAME)
+        self.collection = self._open_collection()
+        self.version += 1
         print("🗑️ Vector store cleared")
 
 
+@dataclass(frozen=True, slots=True)
+class _FaissSnapshot:
+    """
+    A built FAISS index plus the jobs behind its rows, published together
+    with one assignment. Row i of `index` is job i in the lists.
+    """
+    version: tuple
+    index: object
+    ids: list
+    metadatas: list
+    documents: list
+
+
+class FaissJobVectorStore(JobVectorStore):
+    """
+    Read-optimized vector store for the search page.
+    ChromaDB still persists the jobs; queries are answered from an in-memory
+    FAISS HNSW index built from the stored embeddings.
+    """
+    
+    def __init__(self, persist_dir: str = "data/chroma_db", hnsw_m: int = 32):
+        """
+        Initialize the store and build the FAISS index.
+        
+        Args:
+            persist_dir: Where the ChromaDB data lives
+            hnsw_m: Neighbors per node in the HNSW graph
+        """
+        import faiss
+        self._faiss = faiss
+        self.hnsw_m = hnsw_m
+        self._rebuild_lock = threading.Lock()
+        super().__init__(persist_dir)
+        self._build_index()
+    
+    def _build_index(self):
+        """(Re)build the HNSW index from everything stored in ChromaDB."""
+        # Taken before reading, so a write that lands mid-read triggers another rebuild
+        version = self.data_version()
+        data = self.collection.get(include=["embeddings", "metadatas", "documents"])
+        
+        if data['embeddings'] is None or len(data['embeddings']) == 0:
+            vectors = np.zeros((0, 384), dtype=np.float32)
+        else:
+            vectors = np.asarray(data['embeddings'], dtype=np.float32)
+        
+        # Normalized vectors + inner product = cosine similarity
+        self._faiss.normalize_L2(vectors)
+        index = self._faiss.IndexHNSWFlat(vectors.shape[1], self.hnsw_m, self._faiss.METRIC_INNER_PRODUCT)
+        index.add(vectors)
+        
+        # Searches in flight keep the snapshot they started with
+        self._snapshot = _FaissSnapshot(
+            version=version,
+            index=index,
+            ids=data['ids'],
+            metadatas=data['metadatas'],
+            documents=data['documents'],
+        )
+        print(f"✅ FAISS index built with {index.ntotal} vectors")
+    
+    def _ensure_fresh(self):
+        """Rebuild the index if ChromaDB changed since it was built (e.g. refresh_data.py ran)."""
+        if self.data_version() == self._snapshot.version:
+            return
+        with self._rebuild_lock:
+            if self.data_version() != self._snapshot.version:
+                print("🔄 Stored jobs changed - rebuilding FAISS index")
+                self._build_index()
+    
+    def add_jobs(self, jobs: list[JobPosting], batch_size: Optional[int] = None, embeddings: Optional[list] = None):
+        """Add jobs to ChromaDB, then refresh the FAISS index."""
+        result = super().add_jobs(jobs, batch_size=batch_size, embeddings=embeddings)
+        self._build_index()
+        return result
+    
+    def search_batch_by_embedding(
+        self,
+        embeddings: list,
+        n_results: int = 10,
+        experience_level: Optional[str] = None,
+        remote_only: bool = False,
+        min_salary: Optional[float] = None
+    ) -> list[list[dict]]:
+        """Semantic search against the FAISS index (same results format as ChromaDB search)."""
+        self._ensure_fresh()
+        snapshot = self._snapshot  # read once; a concurrent rebuild can't mix old and new rows
+        index = snapshot.index
+        if index.ntotal == 0:
+            return [[] for _ in embeddings]
+        
+        query_vectors = np.array(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+        self._faiss.normalize_L2(query_vectors)
+        
+        # FAISS can't filter on metadata, so over-fetch when filters are set
+        has_filters = experience_level or remote_only or min_salary
+        k = min(index.ntotal, n_results * 4 if has_filters else n_results)
+        # Per-call parameters - setting index.hnsw.efSearch would race with other searches
+        params = self._faiss.SearchParametersHNSW(efSearch=max(64, k))
+        scores, indices = index.search(query_vectors, k, params=params)
+        
+        batches = []
+        for row_scores, row_indices in zip(scores, indices):
+            jobs = []
+            for score, idx in zip(row_scores, row_indices):
+                if idx < 0:
+                    continue
+                metadata = snapshot.metadatas[idx]
+                
+                if experience_level and metadata.get('experience_level') != experience_level:
+                    continue
+                if remote_only and metadata.get('remote') != "True":
+                    continue
+                if min_salary and metadata.get('salary_min', 0) < min_salary:
+                    continue
+                
+                jobs.append({
+                    "document": snapshot.documents[idx],
+                    "metadata": metadata,
+                    "similarity_score": round(max(0.0, float(score)), 3),
+                    "id": snapshot.ids[idx]
+                })
+                if len(jobs) == n_results:
+                    break
+            batches.append(jobs)
+        
+        return batches
+    
+    def clear(self):
+        """Clear all data and reset the FAISS index."""
+        super().clear()
+        self._build_index()
+
+
+@dataclass(frozen=True, slots=True)
+class _MatrixSnapshot:
+    """
+    Everything InMemoryJobVectorStore searches, built together and swapped in
+    with one assignment - a search that grabs it sees one consistent load.
+    Row i of `vectors` and the filter columns is job i in the lists.
+    """
+    version: tuple
+    ids: list
+    metadatas: list
+    documents: list
+    vectors: np.ndarray
+    levels: np.ndarray
+    remote: np.ndarray
+    salary_min: np.ndarray
+
+
+class InMemoryJobVectorStore(JobVectorStore):
+    """
+    Read-optimized vector store that keeps every embedding in one numpy matrix.
+    ChromaDB still persists the jobs; a query is a single matrix product plus a
+    partial sort, and filters are exact boolean masks (no over-fetching).
+    """
+    
+    # Rows scored per step - each step upcasts this many stored vectors to float32
+    SCORE_CHUNK_ROWS = 16384
+    
+    def __init__(self, persist_dir: str = "data/chroma_db", half_precision: bool = True):
+        """
+        Initialize the store and load the vectors.
+        
+        Args:
+            persist_dir: Where the ChromaDB data lives
+            half_precision: Keep the matrix as float16 - half the memory and
+                memory traffic, and cosine scores only move by ~1e-3
+        """
+        self.half_precision = half_precision
+        self._reload_lock = threading.Lock()
+        super().__init__(persist_dir)
+        self._load()
+    
+    def _load(self):
+        """(Re)load every stored embedding and its metadata into memory."""
+        # Taken before reading, so a write that lands mid-read triggers another reload
+        version = self.data_version()
+        data = self.collection.get(include=["embeddings", "metadatas", "documents"])
+        metadatas = data['metadatas']
+        
+        if data['embeddings'] is None or len(data['embeddings']) == 0:
+            vectors = np.zeros((0, 384), dtype=np.float32)
+        else:
+            vectors = np.asarray(data['embeddings'], dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1.0, norms)
+        
+        # Filter columns, so a filter is one vectorized comparison
+        snapshot = _MatrixSnapshot(
+            version=version,
+            ids=data['ids'],
+            metadatas=metadatas,
+            documents=data['documents'],
+            vectors=vectors.astype(np.float16) if self.half_precision else vectors,
+            levels=np.array([m.get('experience_level') for m in metadatas], dtype=object),
+            remote=np.array([m.get('remote') == "True" for m in metadatas], dtype=bool),
+            salary_min=np.array([m.get('salary_min') or 0 for m in metadatas], dtype=np.float64),
+        )
+        
+        # Searches in flight keep the snapshot they started with
+        self._snapshot = snapshot
+        print(f"✅ Loaded {len(snapshot.ids)} vectors into memory")
+    
+    def _ensure_fresh(self):
+        """Reload if ChromaDB changed since the matrix was loaded (e.g. refresh_data.py ran)."""
+        if self.data_version() == self._snapshot.version:
+            return
+        with self._reload_lock:
+            if self.data_version() != self._snapshot.version:
+                print("🔄 Stored jobs changed - reloading vectors")
+                self._load()
+    
+    def add_jobs(self, jobs: list[JobPosting], batch_size: Optional[int] = None, embeddings: Optional[list] = None):
+        """Add jobs to ChromaDB, then reload the in-memory matrix."""
+        result = super().add_jobs(jobs, batch_size=batch_size, embeddings=embeddings)
+        self._load()
+        return result
+    
+    @staticmethod
+    def _filter_mask(
+        snapshot: _MatrixSnapshot,
+        experience_level: Optional[str] = None,
+        remote_only: bool = False,
+        min_salary: Optional[float] = None
+    ) -> Optional[np.ndarray]:
+        """Boolean mask of the snapshot's jobs passing the filters (None when there are no filters)."""
+        mask = None
+        if experience_level:
+            mask = snapshot.levels == experience_level
+        if remote_only:
+            mask = snapshot.remote if mask is None else mask & snapshot.remote
+        if min_salary:
+            above = snapshot.salary_min >= min_salary
+            mask = above if mask is None else mask & above
+        return mask
+    
+    def search_batch_by_embedding(
+        self,
+        embeddings: list,
+        n_results: int = 10,
+        experience_level: Optional[str] = None,
+        remote_only: bool = False,
+        min_salary: Optional[float] = None
+    ) -> list[list[dict]]:
+        """Exact cosine search over the in-memory matrix (same results format as ChromaDB search)."""
+        self._ensure_fresh()
+        snapshot = self._snapshot  # read once; a concurrent reload can't mix old and new rows
+        mask = self._filter_mask(snapshot, experience_level, remote_only, min_salary)
+        candidates = len(snapshot.ids) if mask is None else int(mask.sum())
+        k = min(n_results, candidates)
+        if k == 0:
+            return [[] for _ in embeddings]
+        
+        query_vectors = np.array(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+        norms = np.linalg.norm(query_vectors, axis=1, keepdims=True)
+        query_vectors /= np.where(norms == 0, 1.0, norms)
+        
+        # Unit vectors, so the dot products are cosine similarities. Scored in
+        # chunks: numpy has no fast float16 matmul, so each chunk is upcast
+        # to float32 first (while the full matrix stays small)
+        scores = np.empty((len(query_vectors), len(snapshot.ids)), dtype=np.float32)
+        for start in range(0, len(snapshot.ids), self.SCORE_CHUNK_ROWS):
+            chunk = snapshot.vectors[start:start + self.SCORE_CHUNK_ROWS].astype(np.float32, copy=False)
+            scores[:, start:start + len(chunk)] = query_vectors @ chunk.T
+        if mask is not None:
+            scores[:, ~mask] = -np.inf
+        
+        # Top k per query without sorting every score, then order just those
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        
+        batches = []
+        for row_scores, row_top in zip(scores, top):
+            jobs = []
+            for idx in row_top[np.argsort(-row_scores[row_top])]:
+                jobs.append({
+                    "document": snapshot.documents[idx],
+                    "metadata": snapshot.metadatas[idx],
+                    "similarity_score": round(max(0.0, float(row_scores[idx])), 3),
+                    "id": snapshot.ids[idx]
+                })
+            batches.append(jobs)
+        
+        return batches
+    
+    def clear(self):
+        """Clear all data and empty the in-memory matrix."""
+        super().clear()
+        self._load()
+
+
+def get_vector_store() -> JobVectorStore:
+    """Get the configured vector store backend (VECTOR_BACKEND=chroma|faiss|memory)."""
+    backend = os.getenv("VECTOR_BACKEND", "chroma").lower()
+    
+    if backend == "chroma":
+        return JobVectorStore()
+    elif backend == "faiss":
+        return FaissJobVectorStore()
+    elif backend == "memory":
+        return InMemoryJobVectorStore()
+    else:
+        raise ValueError(f"Unknown VECTOR_BACKEND: {backend}")
+
+
 # Test the vector store
 if __name__ == "__main__":
     from src.data_collection.collectors import SampleDataCollector
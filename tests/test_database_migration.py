@@ -0,0 +1,60 @@
+"""
+Opening a database from before job_skills was the only copy of a job's
+skills: the legacy jobs.skills JSON column is backfilled into job_skills the
+same way new inserts store skills (lowercased, once each), then dropped.
+"""
+import json
+import sqlite3
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.etl.database import JobDatabase
+
+
+def _make_legacy_db(path: Path, skills: list):
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE jobs (
+            id TEXT PRIMARY KEY, title TEXT NOT NULL, company TEXT NOT NULL,
+            location TEXT, description TEXT, salary_min REAL, salary_max REAL,
+            salary_currency TEXT DEFAULT 'USD', job_type TEXT DEFAULT 'Full-time',
+            experience_level TEXT, skills TEXT, remote INTEGER DEFAULT 0, source TEXT,
+            url TEXT, posted_date TEXT, scraped_at TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute(
+        "INSERT INTO jobs (id, title, company, skills, scraped_at) VALUES (?, ?, ?, ?, ?)",
+        ("job-1", "Data Engineer", "Acme", json.dumps(skills), "2024-01-01T00:00:00"),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _stored_skills(path: Path) -> list:
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT skill FROM job_skills WHERE job_id = 'job-1' ORDER BY skill").fetchall()
+    conn.close()
+    return [skill for (skill,) in rows]
+
+
+def test_legacy_skills_are_lowercased_and_deduped(tmp_path):
+    db_path = tmp_path / "jobs.db"
+    _make_legacy_db(db_path, ["Python", "python", "SQL", "AWS", "sql"])
+
+    db = JobDatabase(str(db_path))
+
+    assert _stored_skills(db_path) == ["aws", "python", "sql"]
+    assert sorted(db.get_job("job-1").skills) == ["aws", "python", "sql"]
+    db.close()
+
+
+def test_backfill_runs_once(tmp_path):
+    db_path = tmp_path / "jobs.db"
+    _make_legacy_db(db_path, ["Python", "Docker"])
+
+    JobDatabase(str(db_path)).close()
+    JobDatabase(str(db_path)).close()
+
+    assert _stored_skills(db_path) == ["docker", "python"]
@@ -0,0 +1,58 @@
+"""
+Real collectors should skip a source that answers with something other than
+JSON (maintenance pages, captive portals, ...) instead of crashing the run.
+"""
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.data_collection import real_collectors
+from src.data_collection.real_collectors import ArbeitnowCollector, RemotiveCollector
+
+HTML_BODY = b"<html><body>502 Bad Gateway</body></html>"
+
+
+class _HtmlResponse:
+    """Stand-in for requests.Response: a 200 whose body isn't JSON."""
+    content = HTML_BODY
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def html_session(monkeypatch):
+    monkeypatch.setattr(real_collectors.SESSION, "get", lambda *args, **kwargs: _HtmlResponse())
+
+
+def _html_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, content=HTML_BODY, headers={"Content-Type": "text/html"})
+    ))
+
+
+async def _fetch_async(fetch, arg):
+    async with _html_client() as client:
+        return await fetch(client, arg)
+
+
+def test_remotive_skips_non_json_body(html_session):
+    assert RemotiveCollector()._fetch_category("software-dev") == []
+
+
+def test_arbeitnow_skips_non_json_body(html_session):
+    assert ArbeitnowCollector()._fetch_page(1) is None
+
+
+def test_remotive_async_skips_non_json_body():
+    collector = RemotiveCollector()
+    assert asyncio.run(_fetch_async(collector._fetch_category_async, "software-dev")) == []
+
+
+def test_arbeitnow_async_skips_non_json_body():
+    collector = ArbeitnowCollector()
+    assert asyncio.run(_fetch_async(collector._fetch_page_async, 1)) is None